@@ -1,6 +1,11 @@
-from jupyter_server.serverapp import ServerApp
+import typing as t
+
 from traitlets.config import Config
 
+if t.TYPE_CHECKING:
+    # Only needed for annotations; importing serverapp pulls in most of jupyter_server
+    from jupyter_server.serverapp import ServerApp
+
 
 _PACKAGE_NAME = "nextgen_kernels_api"
 
@@ -9,7 +14,7 @@ def _jupyter_server_extension_points():
     return [{"module": _PACKAGE_NAME}]
 
 
-def _is_gateway_configured(server_app: ServerApp):
+def _is_gateway_configured(server_app: "ServerApp"):
     """
     Check if the server app is configured to use a kernel gateway.
 
@@ -54,7 +59,7 @@ def _is_gateway_configured(server_app: ServerApp):
     return False
 
 
-def _link_jupyter_server_extension(serverapp: ServerApp):
+def _link_jupyter_server_extension(serverapp: "ServerApp"):
     serverapp.log.info("Overriding Kernel APIs with Next Generation Kernels API")
 
     # Check if the server is configured to use a gateway
@@ -75,7 +80,7 @@ def _link_jupyter_server_extension(serverapp: ServerApp):
     serverapp.update_config(c)
 
 
-def _load_jupyter_server_extension(serverapp: ServerApp):
+def _load_jupyter_server_extension(serverapp: "ServerApp"):
     """Load the extension.
 
     Kernel client connection and lifecycle management is now handled automatically
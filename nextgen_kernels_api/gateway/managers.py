@@ -1,9 +1,21 @@
 """Gateway kernel manager that integrates with our kernel monitoring system."""
 
 import asyncio
+import json
+import typing as t
+from queue import Empty
+from time import monotonic
+
+import websocket
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 from jupyter_client import KernelConnectionInfo
 from jupyter_server.gateway.gateway_client import GatewayClient
+from jupyter_server.gateway.managers import ChannelQueue as _ChannelQueue
 from jupyter_server.gateway.managers import GatewayMappingKernelManager
 from jupyter_server.gateway.managers import GatewayKernelManager as _GatewayKernelManager
 from jupyter_server.gateway.managers import GatewayKernelClient as _GatewayKernelClient
@@ -14,6 +26,143 @@ from traitlets import default, Instance, Type
 from ..services.kernels.client import JupyterServerKernelClientMixin
 
 
+def _json_dumps(obj):
+    return json.dumps(obj, ensure_ascii=False).encode("utf8")
+
+
+if orjson is not None:
+    # orjson rejects NaN/Infinity and integers wider than 64 bits, which the
+    # kernel protocol's json allows, so those messages go through json instead
+    def _dumps(obj):
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return _json_dumps(obj)
+
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+else:
+    _dumps = _json_dumps
+    _loads = json.loads
+
+# Message parts handed to listeners, in wire order
+_MSG_PARTS = ("header", "parent_header", "metadata", "content")
+
+
+class ChannelQueue(_ChannelQueue):
+    """Gateway channel queue that wakes asyncio waiters instead of polling.
+
+    The upstream queue is filled by the client's response router thread, and its
+    get_msg() spins on ``asyncio.sleep(0)`` until a message shows up. Here the
+    router thread signals an asyncio.Event on the waiting loop whenever it puts a
+    message (or finishes), so an idle channel costs nothing until traffic arrives.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._loop = None
+        self._message_ready = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def response_router_finished(self) -> bool:
+        return self._response_router_finished
+
+    @response_router_finished.setter
+    def response_router_finished(self, value: bool) -> None:
+        self._response_router_finished = value
+        if value:
+            self._notify_message_ready()
+
+    def _notify_message_ready(self):
+        # Called from the response router thread, so hop onto the waiting loop.
+        # _async_get publishes the event before the loop, so a loop seen here
+        # always has its event.
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._message_ready.set)
+        except RuntimeError:
+            # The loop closed since the check above; nobody is waiting anymore
+            pass
+
+    def _put(self, item):
+        super()._put(item)
+        self._notify_message_ready()
+
+    async def _async_get(self, timeout=None):
+        """Asynchronously get from the queue, waiting for the router to signal a message."""
+        if timeout is None:
+            timeout = float("inf")
+        elif timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        end_time = monotonic() + timeout
+
+        if self._loop is None:
+            # The router thread reads _loop first, so set the event it needs before it
+            self._message_ready = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+
+        while True:
+            try:
+                return self.get(block=False)
+            except Empty:
+                if self.response_router_finished:
+                    raise RuntimeError("Response router had finished") from None
+                remaining = end_time - monotonic()
+                if remaining <= 0:
+                    raise
+
+            # Any put after the failed get() schedules set() for a later loop
+            # iteration, so clearing here cannot lose a wakeup.
+            self._message_ready.clear()
+            try:
+                await asyncio.wait_for(
+                    self._message_ready.wait(),
+                    timeout=None if remaining == float("inf") else remaining,
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def get_msg_nowait(self) -> dict:
+        """Get a queued message without waiting, with the same bookkeeping as get_msg().
+
+        Raises queue.Empty if no message is queued.
+        """
+        msg = self.get_nowait()
+        self.log.debug(
+            "Received message on channel: %s, msg_id: %s, msg_type: %s",
+            self.channel_name,
+            msg["msg_id"],
+            msg["msg_type"] if msg else "null",
+        )
+        self.task_done()
+        return msg
+
+    def send(self, msg: dict) -> None:
+        """Send a message to the gateway, encoding it with orjson when available."""
+        if orjson is None:
+            return super().send(msg)
+        # Datetimes still go through serialize_datetime so the wire format matches upstream
+        try:
+            message = orjson.dumps(
+                msg, default=self.serialize_datetime, option=orjson.OPT_PASSTHROUGH_DATETIME
+            ).replace(b"</", b"<\\/")
+        except orjson.JSONEncodeError:
+            # e.g. integers wider than 64 bits
+            return super().send(msg)
+        self.log.debug(
+            "Sending message on channel: %s, msg_id: %s, msg_type: %s",
+            self.channel_name,
+            msg["msg_id"],
+            msg["msg_type"] if msg else "null",
+        )
+        self.channel_socket.send(message)
+
+
 class GatewayKernelClient(JupyterServerKernelClientMixin, _GatewayKernelClient):
     """
     Gateway kernel client that combines our monitoring capabilities with gateway support.
@@ -28,6 +177,25 @@ class GatewayKernelClient(JupyterServerKernelClientMixin, _GatewayKernelClient):
     and kernel lifecycle management.
     """
 
+    # Most messages drained from a channel per listener dispatch
+    max_batch_size: int = 100
+
+    # Most status updates waiting on the status consumer before they're applied inline
+    max_pending_status: int = 1024
+
+    # connect() skips the kernel_info test entirely, see _test_kernel_communication
+    _needs_comm_test = False
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Maps channel name -> bound channel.send, filled on first use
+        self._channel_send = {}
+        # Reused for every outbound message; ChannelQueue.send serializes it
+        # immediately and keeps no reference to it, and it's cleared after each send
+        self._send_scratch = {}
+        # Status messages waiting for the status consumer, created by start_listening()
+        self._status_queue = None
+
     async def _test_kernel_communication(self, timeout: float = 10.0) -> bool:
         """Skip kernel_info test for gateway kernels.
 
@@ -39,82 +207,283 @@ class GatewayKernelClient(JupyterServerKernelClientMixin, _GatewayKernelClient):
         """
         return True
 
+    def _channel_queue(self, channel_name: str) -> ChannelQueue:
+        """Get (or lazily create) the event-driven queue for a channel."""
+        attr_name = f"_{channel_name}_channel"
+        channel = getattr(self, attr_name)
+        if channel is None:
+            self.log.debug("creating %s channel queue", channel_name)
+            assert self.channel_socket is not None
+            channel = ChannelQueue(channel_name, self.channel_socket, self.log)
+            setattr(self, attr_name, channel)
+            assert self._channel_queues is not None
+            self._channel_queues[channel_name] = channel
+        return channel
+
+    @property
+    def shell_channel(self):
+        """Get the shell channel queue for this kernel."""
+        return self._channel_queue("shell")
+
+    @property
+    def iopub_channel(self):
+        """Get the iopub channel queue for this kernel."""
+        return self._channel_queue("iopub")
+
+    @property
+    def stdin_channel(self):
+        """Get the stdin channel queue for this kernel."""
+        return self._channel_queue("stdin")
+
+    @property
+    def control_channel(self):
+        """Get the control channel queue for this kernel."""
+        return self._channel_queue("control")
+
     def _send_message(self, channel_name: str, msg: list[bytes]):
         # Send to gateway channel
         try:
+            send = self._channel_send.get(channel_name)
+            if send is None:
+                channel = getattr(self, f"{channel_name}_channel", None)
+                if not channel or not hasattr(channel, 'send'):
+                    return
+                send = self._channel_send[channel_name] = channel.send
+
+            # Convert raw message to gateway format (gateway messages are always JSON)
+            header, parent_header, metadata, content = [_loads(part) for part in msg[:4]]
+
+            full_msg = self._send_scratch
+            full_msg['header'] = header
+            full_msg['parent_header'] = parent_header
+            full_msg['metadata'] = metadata
+            full_msg['content'] = content
+            full_msg['buffers'] = msg[4:] if len(msg) > 4 else []
+            full_msg['channel'] = channel_name
+            full_msg['msg_id'] = header.get('msg_id')
+            full_msg['msg_type'] = header.get('msg_type')
+
+            try:
+                send(full_msg)
+            finally:
+                # Don't keep the last message's content alive until the next send
+                full_msg.clear()
+        except Exception as e:
+            self.log.warning("Error handling incoming message on gateway: %s", e)
+
+    async def stop_listening(self):
+        """Stop listening, applying status updates that are still queued first."""
+        status_queue, self._status_queue = self._status_queue, None
+        if status_queue is not None:
+            self._apply_queued_statuses(status_queue)
+        await super().stop_listening()
+
+    def stop_channels(self):
+        """Stop the gateway channels and drop the cached channel senders."""
+        self._channel_send.clear()
+        super().stop_channels()
+
+    def _handle_gateway_message(self, channel_name: str, message: dict) -> t.Optional[list[bytes]]:
+        """Track state for a gateway message and encode it for listeners.
+
+        Returns the message as [header, parent_header, metadata, content, buffers...],
+        or None if there is nothing to route (no listeners attached, or the message
+        is malformed).
+        """
+        # Update execution state from status messages
+        # Gateway messages are already deserialized dicts, so check the type up front
+        # and skip the helper call for the stream/display traffic that dominates iopub
+        if channel_name == "iopub" and message.get("msg_type") == "status":
+            self._queue_status_update(channel_name, message)
+
+        # Kernels running in the background with no frontend attached only need
+        # the state tracking above
+        if not self._listeners:
+            return None
+
+        # Serialize message to standard format for listeners
+        # Gateway messages are dicts, convert to list[bytes] format:
+        # [header, parent_header, metadata, content, buffers...]
+        # Listeners are in-process and never verify the signature, so we
+        # encode the parts directly instead of going through session.serialize().
+        try:
+            msg_list = [_dumps(message[part]) for part in _MSG_PARTS]
+        except KeyError as e:
+            self.log.warning("Gateway message missing part %s on %s", e, channel_name)
+            return None
+        msg_list.extend(message.get("buffers") or [])
+        return msg_list
+
+    def _queue_status_update(self, channel_name: str, message: dict):
+        """Hand a status message to the status consumer, so routing isn't held up by it."""
+        status = (
+            channel_name,
+            message,
+            message.get("parent_header", {}).get("msg_id"),
+            message.get("content", {}).get("execution_state"),
+        )
+        status_queue = self._status_queue
+        if status_queue is not None:
+            try:
+                status_queue.put_nowait(status)
+                return
+            except asyncio.QueueFull:
+                # Dropping a status could leave the kernel looking busy forever,
+                # so fall back to applying it inline, after the older ones still
+                # queued so the final state follows arrival order
+                self._apply_queued_statuses(status_queue)
+        self._update_execution_state_from_status(*status)
+
+    def _apply_queued_statuses(self, status_queue: asyncio.Queue):
+        """Apply every status still waiting on the status consumer, in arrival order."""
+        while not status_queue.empty():
+            self._update_execution_state_from_status(*status_queue.get_nowait())
+
+    async def _consume_status_updates(self, status_queue: asyncio.Queue):
+        """Apply queued status messages to the execution state, in arrival order."""
+        while True:
+            status = await status_queue.get()
+            try:
+                self._update_execution_state_from_status(*status)
+            except Exception as e:
+                self.log.debug("Error updating execution state from gateway status: %s", e)
+
+    def _drain_channel(self, channel_name: str, channel: ChannelQueue, message: dict) -> t.List[list[bytes]]:
+        """Handle a message plus whatever else is already queued on its channel.
+
+        Drains at most max_batch_size messages so a flood cannot hold the event loop.
+        """
+        batch = []
+        for processed in range(1, self.max_batch_size + 1):
+            try:
+                msg_list = self._handle_gateway_message(channel_name, message)
+            except Exception as e:
+                # Skip just this message; the ones already in the batch are still routed
+                self.log.debug("Error handling gateway message in %s: %s", channel_name, e)
+            else:
+                if msg_list is not None:
+                    batch.append(msg_list)
+            if processed == self.max_batch_size:
+                break
+            try:
+                message = channel.get_msg_nowait()
+            except Empty:
+                break
+        return batch
+
+    async def _next_message(self, channel: ChannelQueue, delay: float = 0) -> dict:
+        """Wait for the next message on a channel, optionally after a retry delay."""
+        if delay:
+            await asyncio.sleep(delay)
+        return await channel.get_msg(timeout=None)
+
+    async def start_listening(self):
+        """Start listening for messages on all gateway channels from a single task."""
+        if getattr(self, '_monitoring_tasks', None):
+            # Already listening; don't leave the old tasks running
+            await self.stop_listening()
+
+        self._monitoring_tasks = []
+        self._listening = True
+
+        channels = {}
+        for channel_name in ['iopub', 'shell', 'stdin', 'control']:
             channel = getattr(self, f"{channel_name}_channel", None)
-            if channel and hasattr(channel, 'send'):
-                # Convert raw message to gateway format
-                header = self.session.unpack(msg[0])
-                parent_header = self.session.unpack(msg[1])
-                metadata = self.session.unpack(msg[2])
-                content = self.session.unpack(msg[3])
-
-                full_msg = {
-                    'header': header,
-                    'parent_header': parent_header,
-                    'metadata': metadata,
-                    'content': content,
-                    'buffers': msg[4:] if len(msg) > 4 else [],
-                    'channel': channel_name,
-                    'msg_id': header.get('msg_id'),
-                    'msg_type': header.get('msg_type')
-                }
-
-                channel.send(full_msg)
+            if channel and channel.is_alive():
+                channels[channel_name] = channel
+
+        if channels:
+            self._status_queue = asyncio.Queue(maxsize=self.max_pending_status)
+            self._monitoring_tasks.append(
+                asyncio.create_task(self._consume_status_updates(self._status_queue))
+            )
+            self._monitoring_tasks.append(
+                asyncio.create_task(self._monitor_all_channels(channels))
+            )
+
+        self.log.info("Started listening with %d listeners", len(self._listeners))
+
+    async def _monitor_all_channels(self, channels: t.Dict[str, ChannelQueue]):
+        """Monitor all gateway channels of this kernel for incoming messages.
+
+        One get_msg() waiter stays armed per channel; whichever channel has traffic
+        first is drained and its messages routed to listeners as one batch, then its
+        waiter is re-armed. This keeps a single task per kernel instead of one per
+        channel.
+        """
+        pending = {
+            asyncio.ensure_future(self._next_message(channel)): channel_name
+            for channel_name, channel in channels.items()
+        }
+        error_counts = dict.fromkeys(channels, 0)
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    channel_name = pending.pop(future)
+                    channel = channels[channel_name]
+                    delay = 0
+                    try:
+                        batch = self._drain_channel(channel_name, channel, future.result())
+                        if batch:
+                            await self._route_batch_to_listeners(channel_name, batch)
+                        error_counts[channel_name] = 0
+                    except Exception as e:
+                        if channel.response_router_finished:
+                            # The websocket is closed, no more messages will arrive
+                            continue
+                        #TODO How to signal the kernel manager to restart the kernel, or notify the user the kernel is died
+                        error_counts[channel_name] += 1
+                        error_count = error_counts[channel_name]
+                        if error_count <= 10:
+                            self.log.debug("Error processing gateway message in %s: %s", channel_name, e)
+                        # Back off exponentially (capped) so a transient error only stalls
+                        # the channel briefly, while a persistent one doesn't spin
+                        delay = min(0.1 * 2 ** min(error_count, 6), 5.0)
+
+                    if channel.is_alive():
+                        pending[asyncio.ensure_future(self._next_message(channel, delay))] = channel_name
+
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            self.log.warn(f"Error handling incoming message on gateway: {e}")
+            self.log.error("Gateway channel monitoring failed: %s", e)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _route_responses(self):
+        """Read responses from the websocket and route each to its channel queue.
 
-    async def _monitor_channel_messages(self, channel_name: str, channel):
-        """Monitor a gateway channel for incoming messages."""
+        Same as upstream, but decodes with the module's JSON codec (orjson when
+        installed) since this thread handles every message the kernel sends.
+        """
         try:
-            error_count = 0
-            while channel.is_alive():
+            while not self._channels_stopped:
+                raw_message = self.channel_socket.recv()
+                if not raw_message:
+                    break
                 try:
-                    # Get message from gateway channel queue
-                    message = await channel.get_msg()
-
-                    # Update execution state from status messages
-                    # Gateway messages are already deserialized dicts
-                    self._update_execution_state_from_status(
-                        channel_name,
-                        message,
-                        parent_msg_id=message.get("parent_header", {}).get("msg_id"),
-                        execution_state=message.get("content", {}).get("execution_state")
-                    )
-
-                    # Serialize message to standard format for listeners
-                    # Gateway messages are dicts, convert to list[bytes] format
-                    # session.serialize() returns: [b'<IDS|MSG>', signature, header, parent_header, metadata, content, buffers...]
-                    serialized = self.session.serialize(message)
-
-                    # Skip delimiter (index 0) and signature (index 1) to get [header, parent_header, metadata, content, ...]
-                    if serialized and len(serialized) >= 6:  # Need delimiter + signature + 4 message parts
-                        msg_list = serialized[2:]
-                    else:
-                        self.log.warning(f"Gateway message too short: {len(serialized) if serialized else 0} parts")
-                        continue
-
-                    # Route to listeners
-                    await self._route_to_listeners(channel_name, msg_list)
-                    error_count = 0
-                except asyncio.TimeoutError:
-                    # No message available, continue loop
-                    await asyncio.sleep(0.01)
-                    continue
-                except Exception as e:
-                    #TODO How to signal the kernel manager to restart the kernel, or notify the user the kernel is died
-                    if error_count < 10:
-                        self.log.debug(f"Error processing gateway message in {channel_name}: {e}")
-                        error_count=+1
-                    await asyncio.sleep(10)
+                    response_message = _loads(raw_message)
+                    channel_queue = self._channel_queues[response_message["channel"]]
+                except (ValueError, KeyError, TypeError) as e:
+                    # A bad frame must not stop routing for the whole kernel
+                    self.log.warning("Skipping undecodable gateway message: %s", e)
                     continue
+                channel_queue.put_nowait(response_message)
 
+        except websocket.WebSocketConnectionClosedException:
+            pass  # websocket closure most likely due to shut down
 
-        except asyncio.CancelledError:
-            pass
-        except Exception as e:
-            self.log.error(f"Gateway channel monitoring failed for {channel_name}: {e}")
+        except BaseException as be:
+            if not self._channels_stopped:
+                self.log.warning("Unexpected exception encountered (%s)", be)
+
+        # Notify channel queues that this thread had finished and no more messages are being received
+        for channel_queue in self._channel_queues.values():
+            channel_queue.response_router_finished = True
+
+        self.log.debug("Response router thread exiting...")
 
     def load_connection_info(self, info: KernelConnectionInfo) -> None:
         """Load WebSocket connection info from provisioner.
@@ -132,7 +501,7 @@ class GatewayKernelClient(JupyterServerKernelClientMixin, _GatewayKernelClient):
             )
         
         self.ws_url = info["ws_url"]
-        self.log.debug(f"Loaded WebSocket URL from connection_info: {self.ws_url}")
+        self.log.debug("Loaded WebSocket URL from connection_info: %s", self.ws_url)
         
         # Load session key if provided
         if "key" in info:
@@ -174,6 +543,28 @@ class GatewayKernelManager(_GatewayKernelManager):
     def __init__(self, **kwargs):
         """Initialize the kernel manager and create a kernel client instance."""
         super().__init__(**kwargs)
+        # Websocket url of this kernel on the gateway, built on first use
+        self._ws_url = None
+
+    def get_connection_info(self, session: bool = False) -> KernelConnectionInfo:
+        """Get connection info, including the gateway websocket url for this kernel.
+
+        GatewayKernelClient.load_connection_info() requires a ws_url. The kernel id
+        and gateway url don't change once the kernel is started, so the url is
+        built once per manager.
+        """
+        info = super().get_connection_info(session=session)
+        if self.kernel_id:
+            if self._ws_url is None:
+                gateway_client = GatewayClient.instance()
+                self._ws_url = url_path_join(
+                    gateway_client.ws_url or "",
+                    gateway_client.kernels_endpoint,
+                    url_escape(self.kernel_id),
+                    "channels",
+                )
+            info["ws_url"] = self._ws_url
+        return info
 
     async def post_start_kernel(self, **kwargs):
         """After kernel starts, connect the kernel client.
@@ -190,20 +581,17 @@ class GatewayKernelManager(_GatewayKernelManager):
         self.kernel_client = self.client(session=self.session)
 
         try:
-            # Load latest connection info from kernel manager
+            # Load latest connection info from kernel manager and connect the kernel client
             # The provisioner has now set the real ports
-            self.kernel_client.load_connection_info(self.get_connection_info(session=True))
-
-            # Connect the kernel client
-            success = await self.kernel_client.connect()
+            success = await self.kernel_client.load_and_connect(self.get_connection_info(session=True))
 
             if not success:
                 raise RuntimeError(f"Failed to connect kernel client for kernel {self.kernel_id}")
 
-            self.log.info(f"Successfully connected kernel client for kernel {self.kernel_id}")
+            self.log.info("Successfully connected kernel client for kernel %s", self.kernel_id)
 
         except Exception as e:
-            self.log.error(f"Failed to connect kernel client: {e}")
+            self.log.error("Failed to connect kernel client: %s", e)
             # Re-raise to fail the kernel start
             raise
 
@@ -220,20 +608,30 @@ class GatewayKernelManager(_GatewayKernelManager):
             if restart:
                 # On restart, clear client state but keep connection
                 # The connection will be refreshed in post_start_kernel after restart
-                self.log.debug(f"Clearing kernel client state for restart of kernel {self.kernel_id}")
+                self.log.debug("Clearing kernel client state for restart of kernel %s", self.kernel_id)
                 self.kernel_client.last_shell_status_time = None
                 self.kernel_client.last_control_status_time = None
                 # Disconnect before restart - will reconnect after
-                await self.kernel_client.stop_listening()
-                self.kernel_client.stop_channels()
+                await self._teardown_client()
             else:
                 # On shutdown, fully disconnect the client
-                self.log.debug(f"Disconnecting kernel client for kernel {self.kernel_id}")
-                await self.kernel_client.stop_listening()
-                self.kernel_client.stop_channels()
+                self.log.debug("Disconnecting kernel client for kernel %s", self.kernel_id)
+                await self._teardown_client()
+                # The client's parent is this manager, so drop the cycle now
+                # rather than leave it for the cyclic GC
+                self.kernel_client = None
 
         await super().cleanup_resources(restart=restart)
 
+    async def _teardown_client(self):
+        """Stop listening and close the kernel client's websocket.
+
+        Closing the channels joins the client's response router thread, so it runs
+        in a worker thread to keep the event loop free while many kernels shut down.
+        """
+        await self.kernel_client.stop_listening()
+        await asyncio.to_thread(self.kernel_client.stop_channels)
+
 
 class GatewayMultiKernelManager(GatewayMappingKernelManager):
     """Custom kernel manager that uses enhanced monitoring kernel manager."""
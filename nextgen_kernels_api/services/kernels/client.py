@@ -76,6 +76,7 @@ class JupyterServerKernelClientMixin(HasTraits):
     connection_test_timeout: float = 120.0  # Total timeout for connection test in seconds
     connection_test_check_interval: float = 0.1  # How often to check for messages in seconds
     connection_test_retry_interval: float = 10.0  # How often to retry kernel_info requests in seconds
+    _needs_comm_test: bool = True  # Subclasses whose transport needs no connection test set this False
 
     # Override channel classes to use our custom ones with automatic encoding
     shell_channel_class = Type(ShellChannel)
@@ -244,17 +245,15 @@ class JupyterServerKernelClientMixin(HasTraits):
 
         # Validate message format before routing
         if not msg or len(msg) < 4:
-            self.log.warning(f"Cannot route malformed message on {channel_name}: {len(msg) if msg else 0} parts (expected at least 4)")
+            self.log.warning(
+                "Cannot route malformed message on %s: %d parts (expected at least 4)",
+                channel_name,
+                len(msg) if msg else 0,
+            )
             return
 
         # Extract message type for filtering
-        msg_type = None
-        try:
-            header = self.session.unpack(msg[0]) if msg and len(msg) > 0 else {}
-            msg_type = header.get('msg_type', 'unknown')
-        except Exception as e:
-            self.log.debug(f"Error extracting message type: {e}")
-            msg_type = 'unknown'
+        msg_type = self._get_msg_type(msg)
 
         # Create tasks for listeners that match the filter
         tasks = []
@@ -267,6 +266,53 @@ class JupyterServerKernelClientMixin(HasTraits):
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
+    async def _route_batch_to_listeners(self, channel_name: str, msgs: t.List[list[bytes]]):
+        """Route a batch of messages from one channel to all registered listeners.
+
+        Each matching listener gets a single task that receives its messages in order,
+        rather than one task per message per listener.
+        """
+        if not self._listeners:
+            return
+
+        if len(msgs) == 1:
+            await self._route_to_listeners(channel_name, msgs[0])
+            return
+
+        typed_msgs = []
+        for msg in msgs:
+            if not msg or len(msg) < 4:
+                self.log.warning(
+                    "Cannot route malformed message on %s: %d parts (expected at least 4)",
+                    channel_name,
+                    len(msg) if msg else 0,
+                )
+                continue
+            typed_msgs.append((self._get_msg_type(msg), msg))
+
+        tasks = []
+        for listener, filter_config in self._listeners.items():
+            matching = [
+                msg for msg_type, msg in typed_msgs
+                if self._should_route_to_listener(msg_type, channel_name, filter_config)
+            ]
+            if matching:
+                task = asyncio.create_task(self._call_listener_batch(listener, channel_name, matching))
+                tasks.append(task)
+
+        # Wait for all listeners to complete
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _get_msg_type(self, msg: list[bytes]) -> str:
+        """Extract the message type from a message's header part."""
+        try:
+            header = self.session.unpack(msg[0]) if msg and len(msg) > 0 else {}
+            return header.get('msg_type', 'unknown')
+        except Exception as e:
+            self.log.debug("Error extracting message type: %s", e)
+            return 'unknown'
+
     def _should_route_to_listener(self, msg_type: str, channel_name: str, filter_config: dict) -> bool:
         """Determine if a message should be routed to a listener based on its filter configuration.
 
@@ -301,6 +347,11 @@ class JupyterServerKernelClientMixin(HasTraits):
         except Exception as e:
             self.log.error(f"Error in listener {listener}: {e}")
 
+    async def _call_listener_batch(self, listener: t.Callable, channel_name: str, msgs: t.List[list[bytes]]):
+        """Call a single listener with each message of a batch, in order."""
+        for msg in msgs:
+            await self._call_listener(listener, channel_name, msg)
+
     def _update_execution_state_from_status(self, channel_name: str, msg_dict: dict, parent_msg_id: str = None, execution_state: str = None):
         """Update execution state from a status message if it originated from shell channel.
 
@@ -415,6 +466,10 @@ class JupyterServerKernelClientMixin(HasTraits):
 
     async def start_listening(self):
         """Start listening for messages and monitoring channels."""
+        if getattr(self, '_monitoring_tasks', None):
+            # Already listening, e.g. resumed after a restart; don't leave the old tasks running
+            await self.stop_listening()
+
         # Start background tasks to monitor channels for messages
         self._monitoring_tasks = []
         self._listening = True
@@ -578,6 +633,18 @@ class JupyterServerKernelClientMixin(HasTraits):
         except Exception as e:
             self.log.debug(f"Error sending kernel_info on control channel: {e}")
 
+    async def load_and_connect(self, info: dict) -> bool:
+        """Load connection info and connect to the kernel in one step.
+
+        Args:
+            info: Connection info from the kernel manager, as passed to load_connection_info()
+
+        Returns:
+            bool: True if connection successful, False otherwise
+        """
+        self.load_connection_info(info)
+        return await self.connect()
+
     async def connect(self) -> bool:
         """Connect to the kernel and verify communication.
 
@@ -614,32 +681,13 @@ class JupyterServerKernelClientMixin(HasTraits):
             # Start our listening
             await self.start_listening()
 
-            # Unpause heartbeat channel if method exists
-            if hasattr(self.hb_channel, 'unpause'):
-                self.hb_channel.unpause()
-
-            # Wait for heartbeat
-            attempt = 0
-            max_attempts = 10
-            while not self.hb_channel.is_beating():
-                attempt += 1
-                if attempt > max_attempts:
-                    raise Exception("The kernel took too long to connect to the Kernel Sockets.")
-                await asyncio.sleep(0.1)
-
-            # Test kernel communication (handles retries internally)
-            if not await self._test_kernel_communication():
-                self.log.error(f"Kernel communication test failed after {self.connection_test_timeout}s timeout")
+            if not await self._wait_for_kernel():
                 return False
 
             # Mark connection as ready and process queued messages
             self.mark_connection_ready()
 
-            # Update execution state to idle if it's not already set
-            # (it might already be idle if we received a status message during connection test)
-            if self.execution_state == ExecutionStates.BUSY.value:
-                self.execution_state = ExecutionStates.IDLE.value
-                self.last_activity = datetime.now(timezone.utc)
+            self._mark_idle_if_busy()
 
             self.log.info("Successfully connected to kernel")
             return True
@@ -649,6 +697,69 @@ class JupyterServerKernelClientMixin(HasTraits):
             self._connecting = False
             return False
 
+    async def resume(self) -> bool:
+        """Resume a connected client after its kernel restarted on the same connection info.
+
+        The channels stay open across the restart, so this repeats the rest of
+        connect(): reset the execution state, start listening again, and wait for
+        the new kernel to respond.
+
+        Returns:
+            bool: True if the restarted kernel responded, False otherwise
+        """
+        try:
+            self.execution_state = ExecutionStates.BUSY.value
+            self.last_activity = datetime.now(timezone.utc)
+
+            await self.start_listening()
+
+            if not await self._wait_for_kernel():
+                return False
+
+            self._mark_idle_if_busy()
+
+            self.log.info("Successfully resumed kernel connection")
+            return True
+
+        except Exception as e:
+            self.log.error("Failed to resume kernel connection: %s", e)
+            return False
+
+    async def _wait_for_kernel(self) -> bool:
+        """Wait for the heartbeat, then test kernel communication.
+
+        Raises if the heartbeat doesn't start; returns False if the communication test fails.
+        """
+        # Unpause heartbeat channel if method exists
+        if hasattr(self.hb_channel, 'unpause'):
+            self.hb_channel.unpause()
+
+        # Wait for heartbeat
+        attempt = 0
+        max_attempts = 10
+        while not self.hb_channel.is_beating():
+            attempt += 1
+            if attempt > max_attempts:
+                raise Exception("The kernel took too long to connect to the Kernel Sockets.")
+            await asyncio.sleep(0.1)
+
+        # Test kernel communication (handles retries internally)
+        if self._needs_comm_test and not await self._test_kernel_communication():
+            self.log.error(
+                "Kernel communication test failed after %ss timeout", self.connection_test_timeout
+            )
+            return False
+
+        return True
+
+    def _mark_idle_if_busy(self):
+        """Move the execution state from the connect-time 'busy' to 'idle'."""
+        # Update execution state to idle if it's not already set
+        # (it might already be idle if we received a status message during connection test)
+        if self.execution_state == ExecutionStates.BUSY.value:
+            self.execution_state = ExecutionStates.IDLE.value
+            self.last_activity = datetime.now(timezone.utc)
+
     async def disconnect(self):
         """Disconnect from the kernel and reset connection state.
 
@@ -98,6 +98,10 @@ class KernelClientWebsocketConnection(BaseKernelWebsocketConnection):
         except Exception as e:
             raise RuntimeError(f"Failed to get kernel client for kernel {self.kernel_id}: {e}")
 
+    def _current_kernel_client(self):
+        """Get the kernel manager's kernel client, or None once the kernel has shut down."""
+        return getattr(self.kernel_manager, "kernel_client", None)
+
     async def connect(self):
         """Connect to the kernel via a kernel session with deferred channel connection.
 
@@ -130,9 +134,10 @@ class KernelClientWebsocketConnection(BaseKernelWebsocketConnection):
     def disconnect(self):
         """Disconnect the websocket from the kernel client."""
         try:
-            # Get the kernel client from the kernel manager
-            client = self._get_kernel_client()
-            if client:
+            # The kernel manager drops its client on shutdown, which also dropped
+            # this websocket's listener, so there's nothing to remove then
+            client = self._current_kernel_client()
+            if client is not None:
                 # Remove this websocket's listener from the client
                 client.remove_listener(self.handle_outgoing_message)
         except Exception as e:
@@ -144,8 +149,9 @@ class KernelClientWebsocketConnection(BaseKernelWebsocketConnection):
 
         try:
             # Get the kernel client from the kernel manager
-            client = self._get_kernel_client()
-            if not client:
+            client = self._current_kernel_client()
+            if client is None:
+                self.log.debug("Dropping message for kernel %s, which has no kernel client", self.kernel_id)
                 return
 
             # Extract cellId from metadata and encode into msg_id
@@ -7,20 +7,36 @@ to their corresponding kernel client implementations. This enables:
 - Configuration-based registration for deployment flexibility
 """
 
+import functools
 import importlib
+import json
 import logging
+import os
+import site
+import sys
 import typing as t
 from importlib.metadata import entry_points
+from types import MappingProxyType, ModuleType
 from jupyter_client.provisioning import KernelProvisionerBase
 from jupyter_client.client import KernelClient
 from traitlets.config import SingletonConfigurable
-from traitlets import Type as TraitType
+from traitlets import Type as TraitType, Unicode, observe
 
 from nextgen_kernels_api.services.kernels.client import JupyterServerKernelClient
 
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=1)
+def _kernel_client_entry_points():
+    """Entry points in the 'jupyter_kernel_client_registry' group.
+
+    Scanning installed distributions' metadata is slow and its result doesn't
+    change while the process runs, so it is done once. Call cache_clear() to rescan.
+    """
+    return entry_points(group='jupyter_kernel_client_registry')
+
+
 class KernelClientRegistry(SingletonConfigurable):
     """Central registry (singleton) for mapping provisioner types to kernel clients.
     
@@ -29,7 +45,8 @@ class KernelClientRegistry(SingletonConfigurable):
     
     1. Programmatic registration via register()
     2. Configuration-based registration via provisioner_client_mappings trait
-    3. Entry point discovery via auto_discover_registrations()
+    3. Entry point discovery via auto_discover_registrations(), run lazily on
+       the first lookup
     
     Example usage:
         # Register a mapping programmatically
@@ -55,16 +72,50 @@ class KernelClientRegistry(SingletonConfigurable):
         """
     )
     
+    entry_point_cache_file = Unicode(
+        "",
+        config=True,
+        help="""
+        Path of a JSON file used to cache the 'jupyter_kernel_client_registry'
+        entry points between server starts, e.g. "~/.cache/nextgen-kernels-api/entrypoints.json".
+
+        The cache is keyed on sys.prefix and the modification time of the
+        site-packages directories (including the user site-packages when
+        enabled), so installing or removing packages invalidates it. Empty
+        (the default) disables caching and scans the installed distributions
+        on every start.
+        """
+    )
+
     # Class-level registry for programmatic registrations
     _registry: t.Dict[t.Type[KernelProvisionerBase], t.Type[KernelClient]] = {}
+    # Read-only snapshot of _registry for lookups, built by freeze()
+    _frozen: t.Optional[t.Mapping[type, t.Type[KernelClient]]] = None
+    # Rendered get_registered_mappings() result
+    _mappings_cache: t.Optional[t.Dict[str, str]] = None
+    # Bumped whenever lookups may resolve differently, so callers caching
+    # lookup results can tell when theirs went stale
+    _generation: int = 0
     _initialized: bool = False
 
     def __init__(self, **kwargs: t.Any) -> None:
-        """Initialize the kernel client registry and auto-discover registrations."""
+        """Initialize the kernel client registry.
+
+        Entry point discovery is deferred until the first lookup, so servers that
+        never resolve a provisioner don't pay for scanning installed distributions
+        and importing every registered client module at startup.
+        """
+        # Memoized provisioner type -> client class lookups (set before config loads,
+        # since the fallback observer clears it)
+        self._resolved_cache: t.Dict[type, t.Type[KernelClient]] = {}
+        self._discovered = False
+
         super().__init__(**kwargs)
-        
-        # Auto-discover registrations from entry points
-        self.auto_discover_registrations()
+
+    def _ensure_discovered(self) -> None:
+        """Run entry point discovery once, on first use."""
+        if not self._discovered:
+            self.auto_discover_registrations()
     
     @property
     def fallback_client(self) -> t.Type[KernelClient]:
@@ -74,6 +125,21 @@ class KernelClientRegistry(SingletonConfigurable):
         jupyter_client.client.KernelClient if not set.
         """
         return self.fallback_client_class
+
+    @observe('fallback_client_class')
+    def _fallback_client_class_changed(self, change):
+        """Drop memoized lookups that may have resolved to the old fallback."""
+        self._resolved_cache.clear()
+        KernelClientRegistry._generation += 1
+
+    @classmethod
+    def _registry_changed(cls) -> None:
+        """Drop everything derived from _registry after it changes."""
+        cls._frozen = None
+        cls._mappings_cache = None
+        KernelClientRegistry._generation += 1
+        if cls.initialized():
+            cls.instance()._resolved_cache.clear()
     
     @classmethod
     def register(cls,
@@ -95,8 +161,66 @@ class KernelClientRegistry(SingletonConfigurable):
         >>> KernelClientRegistry.register(SparkProvisioner, DocumentAwareSparkProvisionerAwareKernelClient)
         """
         cls._registry[provisioner_class] = client_class
+        cls._registry_changed()
         logger.info(f"Registered {client_class.__name__} for {provisioner_class.__name__}")
     
+    @classmethod
+    def register_many(cls,
+                      mappings: t.Iterable[t.Tuple[t.Type[KernelProvisionerBase], t.Type[KernelClient]]]) -> None:
+        """Register several provisioner -> kernel client mappings at once.
+
+        Equivalent to calling register() for each pair, but derived lookup state
+        is invalidated once rather than per registration.
+
+        Parameters
+        ----------
+        mappings : Iterable[Tuple[Type[KernelProvisionerBase], Type[KernelClient]]]
+            (provisioner_class, client_class) pairs; later pairs win on duplicates
+
+        Example
+        -------
+        >>> KernelClientRegistry.register_many([
+        ...     (LocalProvisioner, JupyterServerKernelClient),
+        ...     (SparkProvisioner, DocumentAwareSparkProvisionerAwareKernelClient),
+        ... ])
+        """
+        mappings = list(mappings)
+        cls._registry.update(mappings)
+        cls._registry_changed()
+        for provisioner_class, client_class in mappings:
+            logger.info(f"Registered {client_class.__name__} for {provisioner_class.__name__}")
+
+    @classmethod
+    def freeze(cls) -> t.Mapping[type, t.Type[KernelClient]]:
+        """Snapshot the registry into a read-only lookup table.
+
+        The table maps every registered provisioner class, and every subclass of
+        one defined so far, to the client the MRO lookup resolves it to, so those
+        provisioners resolve with a single dict hit. It is rebuilt on the next
+        lookup after the registry changes.
+
+        Returns
+        -------
+        Mapping[type, Type[KernelClient]]
+            The frozen provisioner class to client class mapping
+        """
+        frozen: t.Dict[type, t.Type[KernelClient]] = {}
+        pending = list(cls._registry)
+        while pending:
+            provisioner_class = pending.pop()
+            if provisioner_class in frozen:
+                continue
+            # Same nearest-base rule as _resolve_client, so a subclass reachable
+            # from several registered bases maps to the same client either way
+            for base in provisioner_class.__mro__:
+                client_class = cls._registry.get(base)
+                if client_class is not None:
+                    frozen[provisioner_class] = client_class
+                    break
+            pending.extend(provisioner_class.__subclasses__())
+        cls._frozen = MappingProxyType(frozen)
+        return cls._frozen
+
     @classmethod
     def register_from_string(cls, provisioner_class_name: str, client_class_name: str) -> None:
         """Register a mapping using fully qualified class name strings.
@@ -152,8 +276,14 @@ class KernelClientRegistry(SingletonConfigurable):
         
         Uses the following lookup strategy:
         1. Exact match on provisioner class type
-        2. Match on any base class of the provisioner
+        2. Match on the nearest registered base class in the provisioner's MRO
         3. Return configured fallback client (defaults to KernelClient)
+
+        Registered provisioners and their known subclasses are answered from the
+        table built by freeze(); other types are memoized per provisioner type, so
+        repeated kernels of the same provisioner type resolve with a single dict
+        lookup either way. Both are dropped whenever the registry changes, and the
+        memo also when the fallback client changes.
         
         Parameters
         ----------
@@ -179,19 +309,58 @@ class KernelClientRegistry(SingletonConfigurable):
         """
         if provisioner is None:
             return self.fallback_client
-        
-        provisioner_type = type(provisioner)
-        
-        # Try exact match first
-        if provisioner_type in self._registry:
-            logger.debug(f"Found exact match for {provisioner_type.__name__}")
-            return self._registry[provisioner_type]
-        
-        # Try matching on base classes (inheritance-based matching)
-        for prov_class, client_class in self._registry.items():
-            if isinstance(provisioner, prov_class):
-                logger.debug(f"Found inheritance match: {provisioner_type.__name__} "
-                           f"is a {prov_class.__name__}")
+
+        return self.get_client_for_provisioner_class(type(provisioner))
+
+    def get_client_for_provisioner_class(self, provisioner_type: type) -> t.Type[KernelClient]:
+        """Get the kernel client class for a provisioner class.
+
+        Same lookup as get_client_for_provisioner(), for callers that already
+        hold the provisioner's type.
+
+        Parameters
+        ----------
+        provisioner_type : type
+            The provisioner class to find a client for
+
+        Returns
+        -------
+        Type[KernelClient]
+            The kernel client class to use, or the fallback client if no match found.
+        """
+        # Checked on every lookup, since freeze() can run before this instance
+        # has discovered its entry points (e.g. a new singleton after clear_instance())
+        self._ensure_discovered()
+        frozen = self._frozen
+        if frozen is None:
+            # First lookup, or the registry changed since the last freeze
+            frozen = self.freeze()
+        client_class = frozen.get(provisioner_type)
+        if client_class is not None:
+            return client_class
+
+        # Provisioners with no registered base, or subclasses defined after freezing
+        client_class = self._resolved_cache.get(provisioner_type)
+        if client_class is not None:
+            return client_class
+
+        client_class = self._resolve_client(provisioner_type)
+        self._resolved_cache[provisioner_type] = client_class
+        return client_class
+
+    def _resolve_client(self, provisioner_type: type) -> t.Type[KernelClient]:
+        """Resolve the client class for a provisioner type without consulting the memo."""
+        # Walk the MRO so the lookup costs one dict hit per base class, however
+        # many provisioners are registered. The exact type comes first, and the
+        # nearest registered base class wins for inheritance matches.
+        for base in provisioner_type.__mro__:
+            client_class = self._registry.get(base)
+            if client_class is not None:
+                if base is provisioner_type:
+                    logger.debug(f"Found exact match for {provisioner_type.__name__}")
+                else:
+                    logger.debug(f"Found inheritance match: {provisioner_type.__name__} "
+                               f"is a {base.__name__}")
                 return client_class
         
         # No match found, return fallback
@@ -207,15 +376,21 @@ class KernelClientRegistry(SingletonConfigurable):
         Dict[str, str]
             Dictionary mapping provisioner class names to client class names
         """
-        return {
-            f"{prov.__module__}.{prov.__name__}": f"{client.__module__}.{client.__name__}"
-            for prov, client in cls._registry.items()
-        }
+        if cls.initialized():
+            cls.instance()._ensure_discovered()
+        if cls._mappings_cache is None:
+            cls._mappings_cache = {
+                f"{prov.__module__}.{prov.__name__}": f"{client.__module__}.{client.__name__}"
+                for prov, client in cls._registry.items()
+            }
+        # Copy so callers can't mutate the cached rendering
+        return dict(cls._mappings_cache)
     
     @classmethod
     def clear_registry(cls) -> None:
         """Clear all registered mappings. Primarily useful for testing."""
         cls._registry.clear()
+        cls._registry_changed()
         logger.info("Cleared kernel client registry")
     
     def auto_discover_registrations(self) -> None:
@@ -245,18 +420,48 @@ class KernelClientRegistry(SingletonConfigurable):
         ```
         
         Both name and value use the standard Python entry point format: 'module.path:ClassName'
+
+        This runs automatically on the first get_client_for_provisioner() call;
+        calling it directly forces discovery up front. When entry_point_cache_file
+        is set and still matches the installed distributions, the cached mappings
+        are registered without scanning entry points.
         """
+        self._discovered = True
+
+        cache_key = self._entry_point_cache_key()
+        cached = self._read_entry_point_cache(cache_key)
+        if cached is not None:
+            self.log.debug("Registering %d kernel client entry points from cache", len(cached))
+            for provisioner_class_ref, client_class_ref in cached.items():
+                try:
+                    self.register_from_string(provisioner_class_ref, client_class_ref)
+                except Exception as e:
+                    self.log.warning(
+                        f"Failed to load cached entry point '{provisioner_class_ref}' "
+                        f"with value '{client_class_ref}': {e}"
+                    )
+            return
+
         try:
             # Get entry points for the jupyter_kernel_client_registry group
             # Python 3.10+ returns an EntryPoints object with select method
-            eps = entry_points(group='jupyter_kernel_client_registry')
+            eps = _kernel_client_entry_points()
+
+            # Cache the raw scan result (not what loaded), so an entry point that
+            # fails to import is retried on the next start
+            self._write_entry_point_cache(
+                cache_key, {entry_point.name: entry_point.value for entry_point in eps}
+            )
             
             if not eps:
                 self.log.debug("No entry points found for 'jupyter_kernel_client_registry'")
                 return
             
             self.log.info(f"Discovering kernel client registrations from {len(eps)} entry points")
-            
+
+            # Several entry points commonly name provisioners from the same module
+            module_cache: t.Dict[str, ModuleType] = {}
+
             for entry_point in eps:
                 try:
                     # Entry point name is the provisioner class reference (module:Class format)
@@ -272,7 +477,13 @@ class KernelClientRegistry(SingletonConfigurable):
                         # Fallback to dot notation
                         prov_module_name, prov_class_name = provisioner_class_ref.rsplit('.', 1)
                     
-                    prov_module = importlib.import_module(prov_module_name)
+                    prov_module = module_cache.get(prov_module_name)
+                    if prov_module is None:
+                        # Skip the import machinery entirely for already-loaded modules
+                        prov_module = sys.modules.get(prov_module_name)
+                        if prov_module is None:
+                            prov_module = importlib.import_module(prov_module_name)
+                        module_cache[prov_module_name] = prov_module
                     provisioner_class = getattr(prov_module, prov_class_name)
                     
                     self.log.debug(
@@ -295,6 +506,56 @@ class KernelClientRegistry(SingletonConfigurable):
         except Exception as e:
             logger.warning(f"Error during entry point discovery: {e}")
 
+    def _entry_point_cache_key(self) -> t.Optional[t.List[t.Any]]:
+        """Key identifying the installed distributions, or None when caching is off."""
+        if not self.entry_point_cache_file:
+            return None
+        try:
+            site_dirs = list(site.getsitepackages())
+            if site.ENABLE_USER_SITE:
+                # pip install --user (and editable installs there) land outside sys.prefix
+                site_dirs.append(site.getusersitepackages())
+            site_dirs = [path for path in site_dirs if os.path.isdir(path)]
+            mtime = max((os.path.getmtime(path) for path in site_dirs), default=0.0)
+        except (AttributeError, OSError) as e:
+            # site.getsitepackages() is missing in some legacy virtualenvs
+            self.log.debug("Not caching entry points, site-packages not found: %s", e)
+            return None
+        return [sys.prefix, mtime]
+
+    def _read_entry_point_cache(self, cache_key: t.Optional[t.List[t.Any]]) -> t.Optional[t.Dict[str, str]]:
+        """Return the cached entry point mappings if they match cache_key."""
+        if cache_key is None:
+            return None
+        path = os.path.expanduser(self.entry_point_cache_file)
+        try:
+            with open(path, encoding="utf-8") as f:
+                cache = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.log.debug("Ignoring unreadable entry point cache %s: %s", path, e)
+            return None
+        if not isinstance(cache, dict) or cache.get("key") != cache_key:
+            return None
+        mappings = cache.get("mappings")
+        return mappings if isinstance(mappings, dict) else None
+
+    def _write_entry_point_cache(self, cache_key: t.Optional[t.List[t.Any]], mappings: t.Dict[str, str]) -> None:
+        """Store the entry point mappings under cache_key, ignoring write failures."""
+        if cache_key is None:
+            return
+        path = os.path.expanduser(self.entry_point_cache_file)
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            # Write then rename, so a concurrent start never reads a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": cache_key, "mappings": mappings}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.log.debug("Could not write entry point cache %s: %s", path, e)
+
 
 # Convenience function to get the singleton instance
 def get_registry(config: t.Optional[t.Any] = None) -> KernelClientRegistry:
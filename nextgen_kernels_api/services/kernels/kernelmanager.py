@@ -4,11 +4,17 @@ from jupyter_server.services.kernels.kernelmanager import ServerKernelManager
 from jupyter_server.services.kernels.kernelmanager import (
     AsyncMappingKernelManager,
 )
+from jupyter_client.client import KernelClient
 from traitlets import Type, observe, Instance
 from .client import JupyterServerKernelClient
 from .kernel_client_registry import KernelClientRegistry
 
 
+def _is_zmq_conninfo(info):
+    """Whether connection info describes ZMQ sockets, which survive a kernel restart."""
+    return "shell_port" in info and "ws_url" not in info
+
+
 class KernelManager(ServerKernelManager):
     """Kernel manager with enhanced client.
 
@@ -27,13 +33,6 @@ class KernelManager(ServerKernelManager):
         help="""The kernel client class to use for creating kernel clients."""
     )
 
-    client_factory = Type(
-        default_value=JupyterServerKernelClient,
-        klass='jupyter_client.client.KernelClient',
-        config=True,
-        help="""The kernel client factory class to use."""
-    )
-
     kernel_client = Instance(
         'jupyter_client.client.KernelClient',
         allow_none=True,
@@ -43,12 +42,26 @@ class KernelManager(ServerKernelManager):
     def __init__(self, **kwargs):
         """Initialize the kernel manager and create a kernel client instance."""
         super().__init__(**kwargs)
+        # Connection info kernel_client was connected with, to detect restarts
+        # that come back on the same ports
+        self._last_conninfo = None
+
+    @property
+    def client_factory(self):
+        """The kernel client class used by client(), always the same as client_class."""
+        return self.client_class
+
+    @client_factory.setter
+    def client_factory(self, value):
+        self.client_class = value
 
     @observe('client_class')
     def _client_class_changed(self, change):
-        """Override parent's _client_class_changed to handle Type trait instead of DottedObjectName."""
-        # Set client_factory to the same class
-        self.client_factory = change['new']
+        """Override the parent's client_class observer with a no-op.
+
+        The parent copies client_class (a dotted name there) into a separate
+        client_factory trait; here client_factory reads client_class directly.
+        """
 
     async def _async_post_start_kernel(self, **kwargs):
         """After kernel starts, connect the kernel client.
@@ -64,23 +77,43 @@ class KernelManager(ServerKernelManager):
 
         self.select_client()
 
+        # Load latest connection info from kernel manager
+        # The provisioner has now set the real ports
+        connection_info = self.get_connection_info(session=True)
+
+        if (
+            self.kernel_client is not None
+            and type(self.kernel_client) is self.client_class
+            and _is_zmq_conninfo(connection_info)
+            and connection_info == self._last_conninfo
+        ):
+            # Restarted on the same ports: the client's ZMQ sockets reconnect to
+            # the new kernel by themselves, so keep them instead of rebuilding.
+            # Other transports (e.g. a gateway websocket) are always rebuilt.
+            self.log.debug("Reusing kernel client for restarted kernel %s", self.kernel_id)
+            if not await self.kernel_client.resume():
+                raise RuntimeError(f"Failed to resume kernel client for kernel {self.kernel_id}")
+            return
+
+        if self.kernel_client is not None:
+            # Restarted with new connection info, drop the old client's channels
+            await self._teardown_client()
+            self._last_conninfo = None
+
         self.kernel_client = self.client(session=self.session)
 
         try:
-            # Load latest connection info from kernel manager
-            # The provisioner has now set the real ports
-            self.kernel_client.load_connection_info(self.get_connection_info(session=True))
-
-            # Connect the kernel client
-            success = await self.kernel_client.connect()
+            # Load connection info and connect the kernel client
+            success = await self.kernel_client.load_and_connect(connection_info)
 
             if not success:
                 raise RuntimeError(f"Failed to connect kernel client for kernel {self.kernel_id}")
 
-            self.log.info(f"Successfully connected kernel client for kernel {self.kernel_id}")
+            self._last_conninfo = dict(connection_info)
+            self.log.info("Successfully connected kernel client for kernel %s", self.kernel_id)
 
         except Exception as e:
-            self.log.error(f"Failed to connect kernel client: {e}")
+            self.log.error("Failed to connect kernel client: %s", e)
             # Re-raise to fail the kernel start
             raise
 
@@ -90,8 +123,15 @@ class KernelManager(ServerKernelManager):
         pass
 
     async def cleanup_resources(self, restart=False):
+        """Cleanup resources, disconnecting the kernel client if not restarting."""
+        await self._async_cleanup_resources(restart=restart)
+
+    async def _async_cleanup_resources(self, restart=False):
         """Cleanup resources, disconnecting the kernel client if not restarting.
 
+        jupyter_client's shutdown and restart call this directly rather than
+        cleanup_resources(), so the kernel client is handled here.
+
         Parameters
         ----------
         restart : bool
@@ -101,30 +141,43 @@ class KernelManager(ServerKernelManager):
         if self.kernel_client:
             if restart:
                 # On restart, clear client state but keep connection
-                # The connection will be refreshed in post_start_kernel after restart
-                self.log.debug(f"Clearing kernel client state for restart of kernel {self.kernel_id}")
+                # post_start_kernel reuses the client if the kernel comes back on
+                # the same ports, and replaces it otherwise. Listening stops either
+                # way, so nothing is left running if the restart fails.
+                self.log.debug("Clearing kernel client state for restart of kernel %s", self.kernel_id)
                 self.kernel_client.last_shell_status_time = None
                 self.kernel_client.last_control_status_time = None
-                # Disconnect before restart - will reconnect after
                 await self.kernel_client.stop_listening()
-                self.kernel_client.stop_channels()
             else:
                 # On shutdown, fully disconnect the client
-                self.log.debug(f"Disconnecting kernel client for kernel {self.kernel_id}")
-                await self.kernel_client.stop_listening()
-                self.kernel_client.stop_channels()
+                self.log.debug("Disconnecting kernel client for kernel %s", self.kernel_id)
+                await self._teardown_client()
+                self._last_conninfo = None
+                # The client's parent is this manager, so drop the cycle now
+                # rather than leave it for the cyclic GC
+                self.kernel_client = None
 
-        await super().cleanup_resources(restart=restart)
+        await super()._async_cleanup_resources(restart=restart)
+
+    async def _teardown_client(self):
+        """Stop listening and close the kernel client's channels.
+
+        The channels stay on the event loop thread, since zmq.asyncio sockets are
+        registered with the loop and can't be closed from another thread.
+        """
+        await self.kernel_client.stop_listening()
+        self.kernel_client.stop_channels()
     
 
+def _skip_kernel_hook(self, kernel_id):
+    """Per-kernel AsyncMappingKernelManager hook this package does not use."""
+
+
 class MultiKernelManager(AsyncMappingKernelManager):
     """Custom kernel manager that uses Apple's enhanced monitoring kernel manager."""
 
-    def start_watching_activity(self, kernel_id):
-        pass
-    
-    def stop_buffering(self, kernel_id):
-        pass
+    # Activity watching and message buffering both live in the kernel client
+    start_watching_activity = stop_buffering = _skip_kernel_hook
 
 import typing as t
 
@@ -141,6 +194,52 @@ class ProvisionerAwareKernelManager(KernelManager):
     its paired client expects.
     """
 
+    # Provisioner type -> client class, shared by all managers and valid for
+    # one registry generation (see KernelClientRegistry._generation)
+    _client_class_cache: t.Dict[type, t.Type[KernelClient]] = {}
+    _client_class_cache_generation: int = -1
+
+    # Registry singleton, bound by the first manager that selects a client
+    _client_registry: t.Optional[KernelClientRegistry] = None
+
+    def __init__(self, **kwargs):
+        """Initialize the kernel manager."""
+        super().__init__(**kwargs)
+        # (id(provisioner connection_info), session) -> (connection_info, info)
+        self._conninfo_cache: t.Dict[tuple, tuple] = {}
+        # Manager-attribute connection info, snapshotted once the ports are final
+        self._fallback_conninfo: t.Optional[dict] = None
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop the memoized provisioner to client class lookups."""
+        ProvisionerAwareKernelManager._client_class_cache.clear()
+
+    def _get_client_registry(self) -> KernelClientRegistry:
+        """Get the registry singleton, creating it with this manager's config on first use."""
+        registry = ProvisionerAwareKernelManager._client_registry
+        # The singleton can be replaced (e.g. clear_instance() in tests), so only
+        # reuse the bound one while it is still current
+        if registry is None or registry is not KernelClientRegistry._instance:
+            registry = KernelClientRegistry.instance(config=self.config)
+            ProvisionerAwareKernelManager._client_registry = registry
+        return registry
+
+    def _client_class_for_provisioner(self) -> t.Type[KernelClient]:
+        """Resolve the client class for this manager's provisioner, memoized by type."""
+        registry = self._get_client_registry()
+        if ProvisionerAwareKernelManager._client_class_cache_generation != registry._generation:
+            # The registry changed since the cache was filled
+            self.clear_cache()
+            ProvisionerAwareKernelManager._client_class_cache_generation = registry._generation
+
+        provisioner_type = type(self.provisioner)
+        client_class = self._client_class_cache.get(provisioner_type)
+        if client_class is None:
+            client_class = registry.get_client_for_provisioner_class(provisioner_type)
+            self._client_class_cache[provisioner_type] = client_class
+        return client_class
+
     def get_connection_info(self, session: bool = False) -> dict:
         """Get connection info by delegating to provisioner.
 
@@ -160,23 +259,37 @@ class ProvisionerAwareKernelManager(KernelManager):
             - LocalProvisioner: shell_port, iopub_port, stdin_port, control_port, hb_port, ip, transport
             - SparkProvisioner: ws_url, key
             - Future provisioners: any custom fields they need
+
+            Each call returns a new dict, so callers may modify it. The dict it
+            is copied from is cached until the provisioner replaces its
+            connection_info.
         """
-        if self.provisioner and hasattr(self.provisioner, 'connection_info') and self.provisioner.connection_info :
+        connection_info = getattr(self.provisioner, 'connection_info', None) if self.provisioner else None
+        if connection_info:
+            # Provisioners replace connection_info rather than mutating it, so the
+            # dict's identity tells whether a cached result is still current
+            key = (id(connection_info), session)
+            cached = self._conninfo_cache.get(key)
+            if cached is not None and cached[0] is connection_info:
+                return dict(cached[1])
+
             # Delegate to provisioner (new extensible pattern)
-            info = self.provisioner.connection_info.copy()
-            self.log.debug(f"Got connection info from provisioner: {list(info.keys())}")
+            if session:
+                info = {**connection_info, "key": self.session.key}
+            else:
+                info = dict(connection_info)
+            self.log.debug("Got connection info from provisioner: %s", list(info))
+            self._conninfo_cache[key] = (connection_info, info)
+            # Callers (jupyter_client included) update the result in place, so
+            # never hand out the cached dict itself
+            return dict(info)
+
+        # Fallback: Build from KM attributes (backward compatibility)
+        if self._fallback_conninfo is None:
+            info = self._build_fallback_conninfo()
         else:
-            # Fallback: Build from KM attributes (backward compatibility)
-            info = {
-                "shell_port": self.shell_port,
-                "iopub_port": self.iopub_port,
-                "stdin_port": self.stdin_port,
-                "control_port": self.control_port,
-                "hb_port": self.hb_port,
-                "ip": self.ip,
-                "transport": self.transport,
-                "signature_scheme": self.session.signature_scheme,
-            }
+            # Copy, so callers can't modify the snapshot
+            info = dict(self._fallback_conninfo)
 
         # Add session key if requested
         if session:
@@ -184,22 +297,52 @@ class ProvisionerAwareKernelManager(KernelManager):
 
         return info
 
+    def _build_fallback_conninfo(self) -> dict:
+        """Build connection info from the manager's own port and session traits."""
+        return {
+            "shell_port": self.shell_port,
+            "iopub_port": self.iopub_port,
+            "stdin_port": self.stdin_port,
+            "control_port": self.control_port,
+            "hb_port": self.hb_port,
+            "ip": self.ip,
+            "transport": self.transport,
+            "signature_scheme": self.session.signature_scheme,
+        }
+
+    async def _async_post_start_kernel(self, **kwargs):
+        """Snapshot the fallback connection info before the kernel client connects."""
+        # Ports are assigned before launch and stay fixed until the next restart
+        self._fallback_conninfo = self._build_fallback_conninfo()
+        await super()._async_post_start_kernel(**kwargs)
+
     def select_client(self):
         # Select appropriate client class based on provisioner type
         if self.provisioner:
-            # Get singleton registry instance
-            registry = KernelClientRegistry.instance(config=self.config)
-            client_class = registry.get_client_for_provisioner(self.provisioner)
+            client_class = self._client_class_for_provisioner()
 
             if client_class:
-                self.client_class = client_class
-                self.client_factory = client_class
+                # Most deployments resolve every kernel to the default client, so
+                # skip the trait validation and notification when nothing changes
+                if self.client_class is not client_class:
+                    self.client_class = client_class
                 self.log.debug(
-                    f"Selected client class {client_class.__name__} for provisioner "
-                    f"{type(self.provisioner).__name__}"
+                    "Selected client class %s for provisioner %s",
+                    client_class.__name__,
+                    type(self.provisioner).__name__,
                 )
             else:
                 self.log.warning(
-                    f"No client class registered for provisioner {type(self.provisioner).__name__}, "
-                    f"using default {self.client_class.__name__}"
+                    "No client class registered for provisioner %s, using default %s",
+                    type(self.provisioner).__name__,
+                    self.client_class.__name__,
                 )
+
+    async def _async_cleanup_resources(self, restart=False):
+        """Cleanup resources, dropping cached connection info.
+
+        A restarted kernel gets new connection info from its provisioner.
+        """
+        self._conninfo_cache.clear()
+        self._fallback_conninfo = None
+        await super()._async_cleanup_resources(restart=restart)
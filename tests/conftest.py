@@ -1,6 +1,5 @@
 """Pytest configuration and fixtures for nextgen-kernels-api tests."""
 
-import pytest
-
-# Import pytest-jupyter fixtures for Jupyter Server
-pytest_plugins = ["pytest_jupyter.jupyter_server"]
+# The pytest-jupyter server plugin is not loaded here: none of these tests use
+# its jp_* fixtures, and loading it imports all of jupyter_server at startup.
+# Add ``pytest_plugins = ["pytest_jupyter.jupyter_server"]`` back if a test needs them.
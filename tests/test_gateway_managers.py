@@ -0,0 +1,253 @@
+"""Tests for the gateway ChannelQueue and GatewayKernelClient message paths."""
+
+import asyncio
+import json
+import logging
+import math
+import threading
+from types import SimpleNamespace
+
+import pytest
+from jupyter_client.session import Session
+
+from nextgen_kernels_api.gateway import managers
+from nextgen_kernels_api.gateway.managers import ChannelQueue, GatewayKernelClient
+
+
+def _gateway_message(session, msg_type, content=None, parent_msg_id=None, channel="iopub"):
+    """Build a message as the gateway delivers it: a decoded JSON dict."""
+    msg = session.msg(msg_type, content=content or {})
+    if parent_msg_id is not None:
+        msg["parent_header"] = {"msg_id": parent_msg_id}
+    message = json.loads(session.pack(msg))
+    message["channel"] = channel
+    return message
+
+
+def _status_message(session, execution_state):
+    return _gateway_message(
+        session, "status", {"execution_state": execution_state}, parent_msg_id="shell:abc"
+    )
+
+
+@pytest.fixture
+def session():
+    return Session()
+
+
+@pytest.fixture
+def channel_queue():
+    # is_alive() only checks that there is a socket
+    return ChannelQueue("iopub", object(), logging.getLogger(__name__))
+
+
+@pytest.fixture
+def client():
+    return GatewayKernelClient(kernel_id="test-kernel")
+
+
+def _run_in_thread(func, *args):
+    thread = threading.Thread(target=func, args=args)
+    thread.start()
+    thread.join()
+
+
+class TestChannelQueue:
+    """Test ChannelQueue wakeups against a live event loop."""
+
+    async def test_put_from_thread_wakes_get(self, channel_queue, session):
+        """Test that a put from the router thread wakes a waiting get_msg()."""
+        message = _gateway_message(session, "stream")
+        getter = asyncio.ensure_future(channel_queue.get_msg(timeout=None))
+        # Let the getter find the queue empty and start waiting
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+
+        _run_in_thread(channel_queue.put_nowait, message)
+
+        assert await asyncio.wait_for(getter, timeout=1) == message
+
+    async def test_router_finished_wakes_and_raises(self, channel_queue):
+        """Test that the router finishing wakes waiters, which then raise."""
+        getter = asyncio.ensure_future(channel_queue.get_msg(timeout=None))
+        await asyncio.sleep(0.01)
+        assert not getter.done()
+
+        _run_in_thread(setattr, channel_queue, "response_router_finished", True)
+
+        with pytest.raises(RuntimeError, match="Response router had finished"):
+            await asyncio.wait_for(getter, timeout=1)
+
+    async def test_get_times_out(self, channel_queue):
+        """Test that a get with a timeout gives up when nothing arrives."""
+        with pytest.raises(managers.Empty):
+            await channel_queue.get_msg(timeout=0.01)
+
+
+class TestGatewayKernelClientMessages:
+    """Test the gateway client's inbound and outbound message handling."""
+
+    def test_handle_gateway_message_matches_session_serialize(self, client, session):
+        """Test that listener parts decode the same as session.serialize() parts."""
+        client.add_listener(lambda channel_name, msg: None)
+        message = _gateway_message(session, "stream", {"name": "stdout", "text": "héllo </b>"})
+
+        msg_list = client._handle_gateway_message("iopub", message)
+        expected = session.serialize(message)[2:6]
+
+        assert [session.unpack(part) for part in msg_list] == [
+            session.unpack(part) for part in expected
+        ]
+
+    def test_handle_gateway_message_without_listeners(self, client, session):
+        """Test that nothing is encoded when no listener is attached."""
+        assert client._handle_gateway_message("iopub", _gateway_message(session, "stream")) is None
+
+    @pytest.mark.parametrize("loads", [
+        pytest.param(
+            getattr(managers.orjson, "loads", None),
+            id="orjson",
+            marks=pytest.mark.skipif(managers.orjson is None, reason="orjson not installed"),
+        ),
+        pytest.param(json.loads, id="json"),
+    ])
+    def test_send_message_decodes_parts(self, client, session, monkeypatch, loads):
+        """Test that outbound messages are decoded into the gateway's dict format."""
+        monkeypatch.setattr(managers, "_loads", loads)
+        sent = []
+        # The scratch dict is reused across sends, so keep a copy
+        client._channel_send["shell"] = lambda msg: sent.append(dict(msg))
+        msg = session.msg("execute_request", content={"code": "print('ü')"})
+        parts = session.serialize(msg)[2:]
+
+        client._send_message("shell", parts)
+
+        assert len(sent) == 1
+        assert sent[0]["header"] == json.loads(parts[0])
+        assert sent[0]["content"] == {"code": "print('ü')"}
+        assert sent[0]["buffers"] == []
+        assert sent[0]["channel"] == "shell"
+        assert sent[0]["msg_id"] == msg["header"]["msg_id"]
+        assert sent[0]["msg_type"] == "execute_request"
+        assert client._send_scratch == {}
+
+    def test_route_responses_skips_bad_frames(self, client, channel_queue):
+        """Test that frames orjson rejects are decoded by json, and undecodable ones skipped."""
+        frames = iter([
+            b'{"channel": "iopub", "msg_id": "1", "msg_type": "stream", "content": {"v": NaN}}',
+            b'not json',
+            b'{"channel": "iopub", "msg_id": "2", "msg_type": "stream", "content": {"v": 1180591620717411303424}}',
+            b'',
+        ])
+        client.channel_socket = SimpleNamespace(recv=lambda: next(frames))
+        client._channel_queues = {"iopub": channel_queue}
+
+        client._route_responses()
+
+        first, second = channel_queue.get_nowait(), channel_queue.get_nowait()
+        assert math.isnan(first["content"]["v"])
+        assert second["content"]["v"] == 2 ** 70
+        assert channel_queue.response_router_finished
+
+    def test_handle_gateway_message_wide_integer(self, client, session):
+        """Test that integers orjson can't encode still reach listeners."""
+        client.add_listener(lambda channel_name, msg: None)
+        message = _gateway_message(session, "stream", {"v": 2 ** 70})
+
+        msg_list = client._handle_gateway_message("iopub", message)
+
+        assert session.unpack(msg_list[3]) == {"v": 2 ** 70}
+
+
+class TestGatewayKernelClientMonitoring:
+    """Test draining, status tracking and error backoff of the channel monitor."""
+
+    def test_drain_channel_bounded_by_max_batch_size(self, client, channel_queue, session):
+        """Test that one drain handles at most max_batch_size messages."""
+        client.add_listener(lambda channel_name, msg: None)
+        client.max_batch_size = 3
+        for _ in range(5):
+            channel_queue.put_nowait(_gateway_message(session, "stream"))
+
+        batch = client._drain_channel("iopub", channel_queue, channel_queue.get_msg_nowait())
+
+        assert len(batch) == 3
+        assert channel_queue.qsize() == 2
+        # Drained messages are marked done like the ones get_msg() returns
+        assert channel_queue.unfinished_tasks == 2
+
+    def test_drain_channel_keeps_batch_on_error(self, client, channel_queue, session, monkeypatch):
+        """Test that a message failing mid-batch doesn't lose the rest of the batch."""
+        client.add_listener(lambda channel_name, msg: None)
+        messages = [_gateway_message(session, "stream") for _ in range(3)]
+        for message in messages[1:]:
+            channel_queue.put_nowait(message)
+        handle = client._handle_gateway_message
+
+        def _handle_gateway_message(channel_name, message):
+            if message is messages[1]:
+                raise ValueError("bad message")
+            return handle(channel_name, message)
+
+        monkeypatch.setattr(client, "_handle_gateway_message", _handle_gateway_message)
+
+        batch = client._drain_channel("iopub", channel_queue, messages[0])
+
+        assert len(batch) == 2
+        assert channel_queue.empty()
+
+    async def test_start_listening_replaces_monitor_tasks(self, client):
+        """Test that listening again cancels the previous monitor tasks."""
+        # is_alive() only checks that there is a socket
+        client.channel_socket = object()
+        client._channel_queues = {}
+        stale = asyncio.ensure_future(asyncio.sleep(10))
+        client._monitoring_tasks = [stale]
+
+        await client.start_listening()
+        await asyncio.sleep(0)
+
+        assert stale.cancelled()
+        assert len(client._monitoring_tasks) == 2
+        await client.stop_listening()
+
+    async def test_status_order_preserved_on_overflow(self, client, session):
+        """Test that an overflowing status is applied after the ones already queued."""
+        client._status_queue = asyncio.Queue(maxsize=2)
+        client._queue_status_update("iopub", _status_message(session, "idle"))
+        client._queue_status_update("iopub", _status_message(session, "busy"))
+        assert client._status_queue.full()
+
+        client._queue_status_update("iopub", _status_message(session, "idle"))
+
+        assert client.execution_state == "idle"
+        assert client._status_queue.empty()
+
+    async def test_backoff_resets_after_success(self, client, channel_queue, session, monkeypatch):
+        """Test that the retry delay grows with consecutive errors and resets on success."""
+        for _ in range(5):
+            channel_queue.put_nowait(_gateway_message(session, "stream"))
+
+        outcomes = iter([ValueError, ValueError, None, ValueError, None])
+
+        def _drain_channel(channel_name, channel, message):
+            error = next(outcomes)
+            if error is not None:
+                raise error("bad message")
+            if channel.empty():
+                # The next get raises, which ends monitoring
+                channel.response_router_finished = True
+            return []
+
+        delays = []
+
+        async def _next_message(channel, delay=0):
+            delays.append(delay)
+            return await channel.get_msg(timeout=None)
+
+        monkeypatch.setattr(client, "_drain_channel", _drain_channel)
+        monkeypatch.setattr(client, "_next_message", _next_message)
+
+        await asyncio.wait_for(client._monitor_all_channels({"iopub": channel_queue}), timeout=1)
+
+        assert delays == [0, 0.2, 0.4, 0, 0.2, 0]
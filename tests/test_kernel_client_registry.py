@@ -1,20 +1,25 @@
 """Tests for KernelClientRegistry."""
 
+import os
+
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
 from jupyter_client.provisioning.provisioner_base import KernelProvisionerBase
 from jupyter_client.client import KernelClient
 from traitlets.config import Config
 
+from nextgen_kernels_api.services.kernels import kernel_client_registry
+from nextgen_kernels_api.services.kernels.client import JupyterServerKernelClient
 from nextgen_kernels_api.services.kernels.kernel_client_registry import (
     KernelClientRegistry,
+    _kernel_client_entry_points,
     get_registry,
 )
 
 
 # Mock provisioner and client classes for testing
-class MockProvisionerA(KernelProvisionerBase):
-    """Mock provisioner A for testing."""
+class _MockProvisionerBase(KernelProvisionerBase):
+    """No-op implementation of the provisioner interface shared by the mocks."""
     
     @property
     def has_process(self):
@@ -42,33 +47,12 @@ class MockProvisionerA(KernelProvisionerBase):
         pass
 
 
-class MockProvisionerB(KernelProvisionerBase):
+class MockProvisionerA(_MockProvisionerBase):
+    """Mock provisioner A for testing."""
+
+
+class MockProvisionerB(_MockProvisionerBase):
     """Mock provisioner B for testing."""
-    
-    @property
-    def has_process(self):
-        return False
-    
-    async def poll(self):
-        return None
-    
-    async def wait(self):
-        return None
-    
-    async def send_signal(self, signum):
-        pass
-    
-    async def kill(self, restart=False):
-        pass
-    
-    async def terminate(self, restart=False):
-        pass
-    
-    async def launch_kernel(self, cmd, **kwargs):
-        return {}
-    
-    async def cleanup(self, restart=False):
-        pass
 
 
 class MockProvisionerC(MockProvisionerA):
@@ -76,6 +60,22 @@ class MockProvisionerC(MockProvisionerA):
     pass
 
 
+class UnregisteredProvisioner(_MockProvisionerBase):
+    """Mock provisioner that no test registers."""
+
+
+class BaseProvisionerX(_MockProvisionerBase):
+    """Mock provisioner base X for multiple inheritance tests."""
+
+
+class BaseProvisionerY(_MockProvisionerBase):
+    """Mock provisioner base Y for multiple inheritance tests."""
+
+
+class MultiInheritProvisioner(BaseProvisionerX, BaseProvisionerY):
+    """Mock provisioner inheriting from both X and Y."""
+
+
 class MockKernelClientA(KernelClient):
     """Mock kernel client A for testing."""
     pass
@@ -91,17 +91,84 @@ class MockKernelClientC(KernelClient):
     pass
 
 
+@pytest.fixture(scope="session", autouse=True)
+def registry_session_state():
+    """Restore the registry's state from before these tests once the session ends."""
+    saved_registry = dict(KernelClientRegistry._registry)
+    yield
+    _reset_registry()
+    KernelClientRegistry._registry.update(saved_registry)
+
+
+def _reset_registry():
+    """Drop the singleton instance, the class-level registry and the entry point scan."""
+    KernelClientRegistry.clear_instance()
+    # Also drops the frozen snapshot
+    KernelClientRegistry.clear_registry()
+    # Rescan entry points, so tests patching entry_points see their fakes
+    _kernel_client_entry_points.cache_clear()
+
+
 @pytest.fixture(autouse=True)
 def reset_singleton():
-    """Reset singleton instance between tests."""
-    # Clear the singleton instance
-    KernelClientRegistry._instance = None
-    # Clear the class-level registry
-    KernelClientRegistry._registry.clear()
+    """Reset the singleton instance and registry around each test."""
+    _reset_registry()
     yield
-    # Cleanup after test
-    KernelClientRegistry._instance = None
-    KernelClientRegistry._registry.clear()
+    # Don't leak this test's registrations into later tests or other modules
+    _reset_registry()
+
+
+@pytest.fixture(scope="class")
+def populated_registry():
+    """Registry with MockProvisionerA -> MockKernelClientA, set up once per class.
+
+    Only for read-only test classes, which must also override reset_singleton.
+    """
+    _reset_registry()
+    KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
+    yield KernelClientRegistry.instance()
+    _reset_registry()
+
+
+@pytest.fixture
+def fake_entry_points(monkeypatch):
+    """Replace the registry's entry_points() with one returning the given entry points.
+
+    Calling the fixture installs the fake and returns the list of scanned groups,
+    with one item appended per scan.
+    """
+    def _set(eps):
+        scans = []
+
+        def _entry_points(group=None):
+            scans.append(group)
+            return eps
+
+        # Patch the module object, not a dotted path, since
+        # importlib.import_module may itself be monkeypatched
+        monkeypatch.setattr(kernel_client_registry, 'entry_points', _entry_points)
+        return scans
+    return _set
+
+
+@pytest.fixture
+def patched_imports(monkeypatch):
+    """Make importlib.import_module resolve the 'test_provisioners' and 'test_clients' stand-ins.
+
+    Returns the stand-in modules as prov_module and client_module.
+    """
+    prov_module = SimpleNamespace(MockProvisionerA=MockProvisionerA)
+    client_module = SimpleNamespace(MockKernelClientA=MockKernelClientA)
+
+    def _import(module_name):
+        if 'test_provisioners' in module_name:
+            return prov_module
+        elif 'test_clients' in module_name:
+            return client_module
+        raise ImportError(f"Unknown module: {module_name}")
+
+    monkeypatch.setattr('importlib.import_module', _import)
+    return SimpleNamespace(prov_module=prov_module, client_module=client_module)
 
 
 class TestKernelClientRegistrySingleton:
@@ -146,61 +213,38 @@ class TestKernelClientRegistryRegistration:
         assert len(KernelClientRegistry._registry) == 2
         assert KernelClientRegistry._registry[MockProvisionerA] == MockKernelClientA
         assert KernelClientRegistry._registry[MockProvisionerB] == MockKernelClientB
-    
-    def test_register_from_string_with_colon(self):
-        """Test registration from string with colon notation."""
-        # Mock the import
-        with patch('importlib.import_module') as mock_import:
-            # Setup mock modules
-            mock_prov_module = Mock()
-            mock_prov_module.MockProvisionerA = MockProvisionerA
-            
-            mock_client_module = Mock()
-            mock_client_module.MockKernelClientA = MockKernelClientA
-            
-            def import_side_effect(module_name):
-                if 'test_provisioners' in module_name:
-                    return mock_prov_module
-                elif 'test_clients' in module_name:
-                    return mock_client_module
-                raise ImportError(f"Unknown module: {module_name}")
-            
-            mock_import.side_effect = import_side_effect
-            
-            # Register from string
-            KernelClientRegistry.register_from_string(
-                'test_provisioners:MockProvisionerA',
-                'test_clients:MockKernelClientA'
-            )
-            
-            assert MockProvisionerA in KernelClientRegistry._registry
-    
-    def test_register_from_string_with_dot(self):
-        """Test registration from string with dot notation."""
-        with patch('importlib.import_module') as mock_import:
-            # Setup mock modules
-            mock_prov_module = Mock()
-            mock_prov_module.MockProvisionerA = MockProvisionerA
-            
-            mock_client_module = Mock()
-            mock_client_module.MockKernelClientA = MockKernelClientA
-            
-            def import_side_effect(module_name):
-                if 'test_provisioners' in module_name:
-                    return mock_prov_module
-                elif 'test_clients' in module_name:
-                    return mock_client_module
-                raise ImportError(f"Unknown module: {module_name}")
-            
-            mock_import.side_effect = import_side_effect
-            
-            # Register from string with dot notation
-            KernelClientRegistry.register_from_string(
-                'test_provisioners.MockProvisionerA',
-                'test_clients.MockKernelClientA'
-            )
-            
-            assert MockProvisionerA in KernelClientRegistry._registry
+
+    def test_register_many(self, fake_entry_points):
+        """Test registering several mappings in one call matches repeated register()."""
+        fake_entry_points([])
+        registry = KernelClientRegistry.instance()
+        assert registry.get_client_for_provisioner(MockProvisionerC()) == registry.fallback_client
+
+        KernelClientRegistry.register_many([
+            (MockProvisionerA, MockKernelClientA),
+            (MockProvisionerB, MockKernelClientB),
+            (MockProvisionerA, MockKernelClientC),
+        ])
+
+        assert KernelClientRegistry._registry == {
+            MockProvisionerA: MockKernelClientC,
+            MockProvisionerB: MockKernelClientB,
+        }
+        # Memoized lookups from before the call are invalidated
+        assert registry.get_client_for_provisioner(MockProvisionerC()) == MockKernelClientC
+    
+    @pytest.mark.parametrize("prov_str,client_str", [
+        ('test_provisioners:MockProvisionerA', 'test_clients:MockKernelClientA'),
+        ('test_provisioners.MockProvisionerA', 'test_clients.MockKernelClientA'),
+        # Mixed: ':' for the provisioner, '.' for the client
+        ('test_provisioners:MockProvisionerA', 'test_clients.MockKernelClientA'),
+    ])
+    def test_register_from_string(self, prov_str, client_str, patched_imports):
+        """Test registration from strings in colon, dot and mixed notation."""
+        # Register from string
+        KernelClientRegistry.register_from_string(prov_str, client_str)
+
+        assert KernelClientRegistry._registry[MockProvisionerA] == MockKernelClientA
     
     def test_register_from_string_invalid(self):
         """Test that invalid registration raises error."""
@@ -214,37 +258,6 @@ class TestKernelClientRegistryRegistration:
 class TestKernelClientRegistryLookup:
     """Test client lookup methods."""
     
-    def test_get_client_exact_match(self):
-        """Test exact provisioner type match."""
-        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
-        
-        registry = KernelClientRegistry.instance()
-        provisioner = MockProvisionerA()
-        
-        client_class = registry.get_client_for_provisioner(provisioner)
-        assert client_class == MockKernelClientA
-    
-    def test_get_client_inheritance_match(self):
-        """Test inheritance-based matching."""
-        # Register parent class only
-        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
-        
-        registry = KernelClientRegistry.instance()
-        # Use child class instance
-        provisioner = MockProvisionerC()
-        
-        client_class = registry.get_client_for_provisioner(provisioner)
-        assert client_class == MockKernelClientA
-    
-    def test_get_client_no_match_uses_fallback(self):
-        """Test fallback when no match found."""
-        registry = KernelClientRegistry.instance()
-        provisioner = MockProvisionerA()
-        
-        # No registration, should return fallback (default KernelClient)
-        client_class = registry.get_client_for_provisioner(provisioner)
-        assert client_class == KernelClient
-    
     def test_get_client_configured_fallback(self):
         """Test custom fallback client."""
         config = Config()
@@ -257,13 +270,6 @@ class TestKernelClientRegistryLookup:
         client_class = registry.get_client_for_provisioner(provisioner)
         assert client_class == MockKernelClientC
     
-    def test_get_client_none_provisioner(self):
-        """Test None provisioner returns fallback."""
-        registry = KernelClientRegistry.instance()
-        
-        client_class = registry.get_client_for_provisioner(None)
-        assert client_class == KernelClient
-    
     def test_get_client_exact_match_priority_over_inheritance(self):
         """Test that exact match takes priority over inheritance."""
         # Register both parent and child
@@ -277,6 +283,99 @@ class TestKernelClientRegistryLookup:
         client_class = registry.get_client_for_provisioner(provisioner_c)
         assert client_class == MockKernelClientC
 
+    def test_get_client_memoized_per_provisioner_type(self):
+        """Test that unregistered lookups are memoized by provisioner type."""
+        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
+
+        registry = KernelClientRegistry.instance()
+        fallback = registry.fallback_client
+        assert registry.get_client_for_provisioner(MockProvisionerB()) == fallback
+        assert registry._resolved_cache == {MockProvisionerB: fallback}
+
+        # A later registration for the type must invalidate the memo
+        KernelClientRegistry.register(MockProvisionerB, MockKernelClientB)
+        assert registry._resolved_cache == {}
+        assert registry.get_client_for_provisioner(MockProvisionerB()) == MockKernelClientB
+
+    def test_get_client_memo_cleared_when_fallback_changes(self):
+        """Test that changing the fallback client invalidates memoized fallbacks."""
+        config = Config()
+        config.KernelClientRegistry.fallback_client_class = MockKernelClientB
+
+        registry = KernelClientRegistry.instance(config=config)
+        provisioner = MockProvisionerA()
+        assert registry.get_client_for_provisioner(provisioner) == MockKernelClientB
+
+        registry.fallback_client_class = MockKernelClientC
+        assert registry.get_client_for_provisioner(provisioner) == MockKernelClientC
+
+    def test_freeze_includes_known_subclasses(self):
+        """Test that freezing resolves registered classes and their subclasses."""
+        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
+        KernelClientRegistry.register(MockProvisionerB, MockKernelClientB)
+
+        frozen = KernelClientRegistry.freeze()
+
+        assert frozen[MockProvisionerA] == MockKernelClientA
+        assert frozen[MockProvisionerB] == MockKernelClientB
+        assert frozen[MockProvisionerC] == MockKernelClientA
+        assert KernelProvisionerBase not in frozen
+        with pytest.raises(TypeError):
+            frozen[MockProvisionerA] = MockKernelClientB
+
+    def test_freeze_invalidated_on_register(self):
+        """Test that registering after a lookup is picked up by the next lookup."""
+        registry = KernelClientRegistry.instance()
+        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
+        assert registry.get_client_for_provisioner(MockProvisionerC()) == MockKernelClientA
+
+        KernelClientRegistry.register(MockProvisionerC, MockKernelClientC)
+        assert registry.get_client_for_provisioner(MockProvisionerC()) == MockKernelClientC
+
+
+@pytest.mark.usefixtures("populated_registry")
+class TestKernelClientRegistryPopulatedLookup:
+    """Read-only lookups against a registry populated once for the class."""
+
+    @pytest.fixture(autouse=True)
+    def reset_singleton(self):
+        """These tests don't modify the registry, so keep the class-level setup."""
+
+    def test_get_client_exact_match(self, populated_registry):
+        """Test exact provisioner type match."""
+        provisioner = MockProvisionerA()
+
+        client_class = populated_registry.get_client_for_provisioner(provisioner)
+        assert client_class == MockKernelClientA
+
+    def test_get_client_inheritance_match(self, populated_registry):
+        """Test inheritance-based matching."""
+        # Only the parent class is registered; use a child class instance
+        provisioner = MockProvisionerC()
+
+        client_class = populated_registry.get_client_for_provisioner(provisioner)
+        assert client_class == MockKernelClientA
+
+    def test_get_client_no_match_uses_fallback(self, populated_registry):
+        """Test fallback when no match found."""
+        provisioner = MockProvisionerB()
+
+        # No registration for B, should return the configured fallback
+        client_class = populated_registry.get_client_for_provisioner(provisioner)
+        assert client_class == populated_registry.fallback_client
+
+    def test_get_client_none_provisioner(self, populated_registry):
+        """Test None provisioner returns fallback."""
+        client_class = populated_registry.get_client_for_provisioner(None)
+        assert client_class == populated_registry.fallback_client
+
+    def test_get_client_for_provisioner_class(self, populated_registry):
+        """Test lookup by provisioner class matches lookup by instance."""
+        registry = populated_registry
+        assert registry.get_client_for_provisioner_class(MockProvisionerA) == MockKernelClientA
+        assert registry.get_client_for_provisioner_class(MockProvisionerC) == MockKernelClientA
+        assert registry.get_client_for_provisioner_class(MockProvisionerB) == registry.fallback_client
+
 
 class TestKernelClientRegistryUtilities:
     """Test utility methods."""
@@ -291,6 +390,19 @@ class TestKernelClientRegistryUtilities:
         assert len(mappings) == 2
         assert any('MockProvisionerA' in key for key in mappings.keys())
         assert any('MockProvisionerB' in key for key in mappings.keys())
+
+    def test_get_registered_mappings_refreshed_on_register(self):
+        """Test that the cached mappings are rebuilt after the registry changes."""
+        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
+        mappings = KernelClientRegistry.get_registered_mappings()
+        mappings.clear()
+        assert len(KernelClientRegistry.get_registered_mappings()) == 1
+
+        KernelClientRegistry.register(MockProvisionerB, MockKernelClientB)
+        assert len(KernelClientRegistry.get_registered_mappings()) == 2
+
+        KernelClientRegistry.clear_registry()
+        assert KernelClientRegistry.get_registered_mappings() == {}
     
     def test_clear_registry(self):
         """Test clearing the registry."""
@@ -304,6 +416,7 @@ class TestKernelClientRegistryUtilities:
 class TestKernelClientRegistryAutoDiscovery:
     """Test entry point auto-discovery."""
     
+    @pytest.mark.integration
     def test_auto_discover_real_entry_point_from_pyproject(self):
         """Test that the real entry point from pyproject.toml is discovered.
         
@@ -341,117 +454,160 @@ class TestKernelClientRegistryAutoDiscovery:
         assert ':' in spark_ep.name  # Provisioner should be module:Class
         assert ':' in spark_ep.value  # Client should be module:Class
     
-    def test_auto_discover_with_no_entry_points(self):
+    def test_auto_discover_with_no_entry_points(self, fake_entry_points):
         """Test auto-discovery when no entry points exist."""
-        with patch('nextgen_kernels_api.services.kernels.kernel_client_registry.entry_points') as mock_eps:
-            # Mock empty entry points
-            mock_eps.return_value = []
-            
-            registry = KernelClientRegistry.instance()
-            # Should not raise, just log debug message
-            assert len(KernelClientRegistry._registry) == 0
+        scans = fake_entry_points([])
+
+        registry = KernelClientRegistry.instance()
+        # The first lookup triggers discovery, which should not raise
+        registry.get_client_for_provisioner(MockProvisionerA())
+
+        assert scans == ['jupyter_kernel_client_registry']
+        assert len(KernelClientRegistry._registry) == 0
     
-    def test_auto_discover_with_entry_points(self):
+    def test_auto_discover_with_entry_points(self, fake_entry_points, patched_imports):
         """Test auto-discovery with valid entry points."""
-        with patch('nextgen_kernels_api.services.kernels.kernel_client_registry.entry_points') as mock_eps, \
-             patch('importlib.import_module') as mock_import:
-            
-            # Create mock entry point
-            mock_ep = MagicMock()
-            mock_ep.name = 'test_provisioners:MockProvisionerA'
-            mock_ep.value = 'test_clients:MockKernelClientA'
-            mock_ep.load.return_value = MockKernelClientA
-            
-            mock_eps.return_value = [mock_ep]
-            
-            # Setup import mocks
-            mock_prov_module = Mock()
-            mock_prov_module.MockProvisionerA = MockProvisionerA
-            mock_import.return_value = mock_prov_module
-            
-            # Create instance (triggers auto-discovery)
-            registry = KernelClientRegistry.instance()
-            
-            # Verify registration happened
-            assert MockProvisionerA in KernelClientRegistry._registry
-            assert KernelClientRegistry._registry[MockProvisionerA] == MockKernelClientA
+        # Create mock entry point
+        mock_ep = SimpleNamespace(
+            name='test_provisioners:MockProvisionerA',
+            value='test_clients:MockKernelClientA',
+            load=lambda: MockKernelClientA,
+        )
+        fake_entry_points([mock_ep])
+
+        # First lookup triggers auto-discovery
+        registry = KernelClientRegistry.instance()
+        assert registry.get_client_for_provisioner(MockProvisionerA()) == MockKernelClientA
+
+        # Verify registration happened
+        assert MockProvisionerA in KernelClientRegistry._registry
+        assert KernelClientRegistry._registry[MockProvisionerA] == MockKernelClientA
     
-    def test_auto_discover_handles_failed_entry_point(self):
+    def test_auto_discover_handles_failed_entry_point(self, fake_entry_points, patched_imports):
         """Test that failed entry points don't break auto-discovery."""
-        with patch('nextgen_kernels_api.services.kernels.kernel_client_registry.entry_points') as mock_eps:
-            
-            # Create mock entry points - one good, one bad
-            mock_ep_good = MagicMock()
-            mock_ep_good.name = 'test_provisioners:MockProvisionerA'
-            mock_ep_good.value = 'test_clients:MockKernelClientA'
-            mock_ep_good.load.return_value = MockKernelClientA
-            
-            mock_ep_bad = MagicMock()
-            mock_ep_bad.name = 'bad:Provisioner'
-            mock_ep_bad.value = 'bad:Client'
-            mock_ep_bad.load.side_effect = ImportError("Module not found")
-            
-            mock_eps.return_value = [mock_ep_good, mock_ep_bad]
-            
-            with patch('importlib.import_module') as mock_import:
-                mock_prov_module = Mock()
-                mock_prov_module.MockProvisionerA = MockProvisionerA
-                mock_import.return_value = mock_prov_module
-                
-                # Create instance (should handle bad entry point gracefully)
-                registry = KernelClientRegistry.instance()
-                
-                # Good one should still be registered
-                assert MockProvisionerA in KernelClientRegistry._registry
+        # Create mock entry points - one good, one bad
+        mock_ep_good = SimpleNamespace(
+            name='test_provisioners:MockProvisionerA',
+            value='test_clients:MockKernelClientA',
+            load=lambda: MockKernelClientA,
+        )
 
+        def _raise():
+            raise ImportError("Module not found")
 
-class TestKernelClientRegistryFallbackClient:
-    """Test fallback client configuration."""
-    
-    def test_default_fallback_is_kernel_client(self):
-        """Test that default fallback is jupyter_client.client.KernelClient."""
+        mock_ep_bad = SimpleNamespace(name='bad:Provisioner', value='bad:Client', load=_raise)
+        fake_entry_points([mock_ep_good, mock_ep_bad])
+
+        # First lookup triggers discovery (should handle bad entry point gracefully)
         registry = KernelClientRegistry.instance()
-        assert registry.fallback_client == KernelClient
-    
-    def test_configured_fallback_client(self):
-        """Test configuring custom fallback client."""
+        registry.get_client_for_provisioner(MockProvisionerA())
+
+        # Good one should still be registered
+        assert MockProvisionerA in KernelClientRegistry._registry
+
+    def test_auto_discover_deferred_until_first_lookup(self, fake_entry_points):
+        """Test that entry points are only scanned once, on the first lookup."""
+        scans = fake_entry_points([])
+
+        registry = KernelClientRegistry.instance()
+        assert scans == []
+
+        registry.get_client_for_provisioner(MockProvisionerA())
+        registry.get_client_for_provisioner(MockProvisionerB())
+        assert len(scans) == 1
+
+    def test_auto_discover_after_freeze(self, fake_entry_points, patched_imports):
+        """Test that freezing before the first lookup doesn't skip discovery."""
+        mock_ep = SimpleNamespace(
+            name='test_provisioners:MockProvisionerA',
+            value='test_clients:MockKernelClientA',
+            load=lambda: MockKernelClientA,
+        )
+        fake_entry_points([mock_ep])
+
+        registry = KernelClientRegistry.instance()
+        KernelClientRegistry.freeze()
+
+        assert registry.get_client_for_provisioner(MockProvisionerA()) == MockKernelClientA
+
+    def test_auto_discover_entry_point_cache(self, fake_entry_points, tmp_path):
+        """Test that a warm entry point cache skips the entry point scan."""
+        cache_file = tmp_path / "cache" / "entrypoints.json"
         config = Config()
-        config.KernelClientRegistry.fallback_client_class = MockKernelClientC
-        
+        config.KernelClientRegistry.entry_point_cache_file = str(cache_file)
+
+        mock_ep = SimpleNamespace(
+            name=f'{MockProvisionerA.__module__}:MockProvisionerA',
+            value=f'{MockKernelClientA.__module__}:MockKernelClientA',
+            load=lambda: MockKernelClientA,
+        )
+        scans = fake_entry_points([mock_ep])
+
         registry = KernelClientRegistry.instance(config=config)
-        assert registry.fallback_client == MockKernelClientC
-    
-    def test_fallback_used_when_no_match(self):
-        """Test fallback is used when no provisioner match."""
+        registry.auto_discover_registrations()
+        assert cache_file.exists()
+
+        # A fresh process-equivalent registry registers from the cache alone
+        KernelClientRegistry.clear_registry()
+        _kernel_client_entry_points.cache_clear()
+        scans.clear()
+        registry.auto_discover_registrations()
+
+        assert scans == []
+        assert KernelClientRegistry._registry[MockProvisionerA] == MockKernelClientA
+
+    def test_auto_discover_entry_point_cache_stale_key(self, fake_entry_points, tmp_path):
+        """Test that a cache written for other installed packages is ignored."""
+        cache_file = tmp_path / "entrypoints.json"
+        cache_file.write_text('{"key": ["elsewhere", 0], "mappings": {"bad:Provisioner": "bad:Client"}}')
         config = Config()
-        config.KernelClientRegistry.fallback_client_class = MockKernelClientC
-        
+        config.KernelClientRegistry.entry_point_cache_file = str(cache_file)
+        scans = fake_entry_points([])
+
         registry = KernelClientRegistry.instance(config=config)
-        provisioner = MockProvisionerA()
-        
-        # No registration for MockProvisionerA, should get fallback
-        client_class = registry.get_client_for_provisioner(provisioner)
-        assert client_class == MockKernelClientC
+        registry.auto_discover_registrations()
+
+        assert len(scans) == 1
+        assert '"mappings": {}' in cache_file.read_text()
+
+    def test_entry_point_cache_key_tracks_user_site(self, monkeypatch, tmp_path):
+        """Test that installing into the user site-packages changes the cache key."""
+        user_site = tmp_path / "user-site"
+        user_site.mkdir()
+        monkeypatch.setattr(kernel_client_registry.site, 'getsitepackages', lambda: [])
+        monkeypatch.setattr(kernel_client_registry.site, 'getusersitepackages', lambda: str(user_site))
+        monkeypatch.setattr(kernel_client_registry.site, 'ENABLE_USER_SITE', True)
+        config = Config()
+        config.KernelClientRegistry.entry_point_cache_file = str(tmp_path / "entrypoints.json")
+
+        registry = KernelClientRegistry.instance(config=config)
+        key = registry._entry_point_cache_key()
+        os.utime(user_site, (0, 12345))
+
+        assert registry._entry_point_cache_key() != key
+
+
+class TestKernelClientRegistryFallbackClient:
+    """Test fallback client configuration."""
     
-    def test_fallback_configured_with_string_path(self):
-        """Test configuring fallback client with string path (like in jupyter_config.py).
-        
-        This tests the scenario where configuration uses string paths:
-        c.KernelClientRegistry.fallback_client_class = "module.path.ClassName"
-        """
+    @pytest.mark.parametrize("fallback_config,expected", [
+        # Default
+        (None, JupyterServerKernelClient),
+        # String path, as in jupyter_config.py:
+        # c.KernelClientRegistry.fallback_client_class = "module.path.ClassName"
+        ("jupyter_client.client.KernelClient", KernelClient),
+    ])
+    def test_fallback_client(self, fallback_config, expected):
+        """Test the default and configured fallback client, and its use when no provisioner matches."""
         config = Config()
-        # Use string path to configure fallback (Type trait supports this)
-        config.KernelClientRegistry.fallback_client_class = "jupyter_client.client.KernelClient"
-        
+        if fallback_config is not None:
+            config.KernelClientRegistry.fallback_client_class = fallback_config
+
         registry = KernelClientRegistry.instance(config=config)
-        
-        # Verify the string was converted to the actual class
-        assert registry.fallback_client == KernelClient
-        
-        # Verify it's used when no provisioner match
-        provisioner = MockProvisionerA()
-        client_class = registry.get_client_for_provisioner(provisioner)
-        assert client_class == KernelClient
+        assert registry.fallback_client == expected
+
+        # No registration for MockProvisionerA, should get the fallback
+        assert registry.get_client_for_provisioner(MockProvisionerA()) == expected
 
 
 class TestKernelClientRegistryIntegration:
@@ -460,8 +616,10 @@ class TestKernelClientRegistryIntegration:
     def test_full_registration_and_lookup_workflow(self):
         """Test complete workflow: register, lookup exact, lookup inherited, lookup missing."""
         # Register two provisioners
-        KernelClientRegistry.register(MockProvisionerA, MockKernelClientA)
-        KernelClientRegistry.register(MockProvisionerB, MockKernelClientB)
+        KernelClientRegistry.register_many([
+            (MockProvisionerA, MockKernelClientA),
+            (MockProvisionerB, MockKernelClientB),
+        ])
         
         registry = KernelClientRegistry.instance()
         
@@ -478,11 +636,8 @@ class TestKernelClientRegistryIntegration:
         assert registry.get_client_for_provisioner(prov_c) == MockKernelClientA
         
         # Test no match - should return fallback
-        class UnregisteredProvisioner(KernelProvisionerBase):
-            pass
-        
         prov_unreg = UnregisteredProvisioner()
-        assert registry.get_client_for_provisioner(prov_unreg) == KernelClient
+        assert registry.get_client_for_provisioner(prov_unreg) == registry.fallback_client
     
     def test_registration_updates_work(self):
         """Test that re-registration updates the mapping."""
@@ -517,61 +672,25 @@ class TestKernelClientRegistryIntegration:
 class TestKernelClientRegistryEdgeCases:
     """Test edge cases and error handling."""
     
-    def test_get_client_for_none_provisioner(self):
-        """Test handling None provisioner."""
-        registry = KernelClientRegistry.instance()
-        client_class = registry.get_client_for_provisioner(None)
-        assert client_class == KernelClient  # Should return fallback
-    
-    def test_register_from_string_with_mixed_separators(self):
-        """Test register_from_string handles both : and . separators."""
-        with patch('importlib.import_module') as mock_import:
-            mock_prov_module = Mock()
-            mock_prov_module.MockProvisionerA = MockProvisionerA
-            
-            mock_client_module = Mock()
-            mock_client_module.MockKernelClientA = MockKernelClientA
-            
-            def import_side_effect(module_name):
-                if 'test_provisioners' in module_name:
-                    return mock_prov_module
-                elif 'test_clients' in module_name:
-                    return mock_client_module
-                raise ImportError(f"Unknown module: {module_name}")
-            
-            mock_import.side_effect = import_side_effect
-            
-            # Use : for provisioner, . for client
-            KernelClientRegistry.register_from_string(
-                'test_provisioners:MockProvisionerA',
-                'test_clients.MockKernelClientA'
-            )
-            
-            assert MockProvisionerA in KernelClientRegistry._registry
-    
+    # A None provisioner is covered by TestKernelClientRegistryPopulatedLookup.test_get_client_none_provisioner
+
     def test_get_registered_mappings_empty(self):
         """Test get_registered_mappings with empty registry."""
         mappings = KernelClientRegistry.get_registered_mappings()
         assert mappings == {}
     
-    def test_multiple_inheritance_match_first_wins(self):
-        """Test that when multiple base classes match, first registered wins."""
-        class BaseProvisionerX(KernelProvisionerBase):
-            pass
-        
-        class BaseProvisionerY(KernelProvisionerBase):
-            pass
-        
-        class MultiInheritProvisioner(BaseProvisionerX, BaseProvisionerY):
-            pass
-        
-        # Register both base classes
-        KernelClientRegistry.register(BaseProvisionerX, MockKernelClientA)
-        KernelClientRegistry.register(BaseProvisionerY, MockKernelClientB)
+    @pytest.mark.parametrize("registration_order", [
+        (BaseProvisionerX, BaseProvisionerY),
+        (BaseProvisionerY, BaseProvisionerX),
+    ])
+    def test_multiple_inheritance_nearest_mro_base_wins(self, registration_order):
+        """Test that when multiple base classes match, the nearest in the MRO wins."""
+        clients = {BaseProvisionerX: MockKernelClientA, BaseProvisionerY: MockKernelClientB}
+        for base in registration_order:
+            KernelClientRegistry.register(base, clients[base])
         
         registry = KernelClientRegistry.instance()
         prov = MultiInheritProvisioner()
         
-        # Should match one of the base classes (iteration order dependent)
-        client_class = registry.get_client_for_provisioner(prov)
-        assert client_class in (MockKernelClientA, MockKernelClientB)
+        # X precedes Y in MultiInheritProvisioner's MRO, whatever the registration order
+        assert registry.get_client_for_provisioner(prov) == MockKernelClientA
@@ -0,0 +1,265 @@
+"""Tests for KernelManager and ProvisionerAwareKernelManager."""
+
+import asyncio
+
+import pytest
+from jupyter_client.provisioning.provisioner_base import KernelProvisionerBase
+from jupyter_server.services.kernels.kernelmanager import ServerKernelManager
+
+from nextgen_kernels_api.services.kernels import kernel_client_registry
+from nextgen_kernels_api.services.kernels.client import JupyterServerKernelClient
+from nextgen_kernels_api.services.kernels.kernel_client_registry import KernelClientRegistry
+from nextgen_kernels_api.services.kernels.kernelmanager import (
+    KernelManager,
+    ProvisionerAwareKernelManager,
+)
+
+ZMQ_INFO = {
+    "shell_port": 50001,
+    "iopub_port": 50002,
+    "stdin_port": 50003,
+    "control_port": 50004,
+    "hb_port": 50005,
+    "ip": "127.0.0.1",
+    "transport": "tcp",
+    "signature_scheme": "hmac-sha256",
+}
+
+
+class MockProvisioner(KernelProvisionerBase):
+    """Provisioner that only carries connection_info."""
+
+    @property
+    def has_process(self):
+        return False
+
+    async def poll(self):
+        return None
+
+    async def wait(self):
+        return None
+
+    async def send_signal(self, signum):
+        pass
+
+    async def kill(self, restart=False):
+        pass
+
+    async def terminate(self, restart=False):
+        pass
+
+    async def launch_kernel(self, cmd, **kwargs):
+        return {}
+
+    async def cleanup(self, restart=False):
+        pass
+
+
+class MockKernelClient(JupyterServerKernelClient):
+    """Kernel client that records connection calls instead of opening sockets."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    async def load_and_connect(self, info):
+        self.calls.append("connect")
+        return True
+
+    async def resume(self):
+        self.calls.append("resume")
+        return True
+
+    async def stop_listening(self):
+        self.calls.append("stop_listening")
+
+    def stop_channels(self):
+        self.calls.append("stop_channels")
+
+
+@pytest.fixture(autouse=True)
+def client_registry(monkeypatch):
+    """Registry with no entry points, restored along with the client class cache afterwards."""
+    monkeypatch.setattr(kernel_client_registry, "_kernel_client_entry_points", lambda: [])
+    saved_registry = dict(KernelClientRegistry._registry)
+    KernelClientRegistry.clear_instance()
+    ProvisionerAwareKernelManager.clear_cache()
+    yield KernelClientRegistry
+    KernelClientRegistry.clear_instance()
+    KernelClientRegistry.clear_registry()
+    KernelClientRegistry.register_many(saved_registry.items())
+    ProvisionerAwareKernelManager.clear_cache()
+
+
+@pytest.fixture
+def kernel_lifecycle(monkeypatch):
+    """Skip the parent classes' kernel launch and cleanup work, which needs a real kernel."""
+    async def _noop(self, *args, **kwargs):
+        pass
+
+    async def _pre_start_kernel(self, **kwargs):
+        return ["kernel"], kwargs
+
+    monkeypatch.setattr(ServerKernelManager, "_async_pre_start_kernel", _pre_start_kernel)
+    monkeypatch.setattr(ServerKernelManager, "_async_launch_kernel", _noop)
+    monkeypatch.setattr(ServerKernelManager, "_async_post_start_kernel", _noop)
+    monkeypatch.setattr(ServerKernelManager, "_async_cleanup_resources", _noop)
+
+
+@pytest.fixture
+def manager():
+    km = ProvisionerAwareKernelManager()
+    km.provisioner = MockProvisioner()
+    km.provisioner.connection_info = dict(ZMQ_INFO)
+    return km
+
+
+class TestKernelManagerClientClass:
+    """Test client_factory as a view of client_class."""
+
+    def test_client_builds_client_class(self):
+        """Test that client() builds an instance of client_class."""
+        km = KernelManager()
+        km.client_class = MockKernelClient
+
+        assert type(km.client(session=km.session)) is MockKernelClient
+
+    def test_client_factory_assignment_updates_client_class(self):
+        """Test that assigning client_factory sets client_class."""
+        km = KernelManager()
+        km.client_factory = MockKernelClient
+
+        assert km.client_class is MockKernelClient
+        assert km.client_factory is MockKernelClient
+
+
+class TestProvisionerAwareConnectionInfo:
+    """Test connection info caching."""
+
+    def test_result_is_a_copy(self, manager):
+        """Test that modifying a result doesn't affect later calls."""
+        info = manager.get_connection_info(session=True)
+        assert info["key"] == manager.session.key
+        info["shell_port"] = 1
+
+        assert manager.get_connection_info(session=True)["shell_port"] == ZMQ_INFO["shell_port"]
+        assert manager.get_connection_info() == ZMQ_INFO
+
+    def test_cache_invalidated_when_provisioner_replaces_info(self, manager):
+        """Test that replacing the provisioner's connection_info is picked up."""
+        assert manager.get_connection_info()["shell_port"] == ZMQ_INFO["shell_port"]
+
+        manager.provisioner.connection_info = {**ZMQ_INFO, "shell_port": 60001}
+
+        assert manager.get_connection_info()["shell_port"] == 60001
+
+    async def test_cache_cleared_on_cleanup(self, manager, kernel_lifecycle):
+        """Test that cleanup_resources drops the cached connection info."""
+        manager.get_connection_info()
+        manager._fallback_conninfo = manager._build_fallback_conninfo()
+        assert manager._conninfo_cache
+
+        await manager.cleanup_resources(restart=True)
+
+        assert manager._conninfo_cache == {}
+        assert manager._fallback_conninfo is None
+
+    def test_fallback_snapshot_is_copied(self):
+        """Test that modifying a fallback result leaves the snapshot intact."""
+        km = ProvisionerAwareKernelManager()
+        km._fallback_conninfo = km._build_fallback_conninfo()
+
+        km.get_connection_info()["ip"] = "10.0.0.1"
+
+        assert km.get_connection_info()["ip"] == km.ip
+
+
+class TestProvisionerAwareSelectClient:
+    """Test client class selection through the registry."""
+
+    def test_select_client_follows_registry_changes(self, manager, client_registry):
+        """Test that a registration after a lookup is picked up via the registry generation."""
+        manager.select_client()
+        assert manager.client_class is JupyterServerKernelClient
+
+        client_registry.register(MockProvisioner, MockKernelClient)
+        manager.select_client()
+
+        assert manager.client_class is MockKernelClient
+
+
+class TestKernelManagerRestart:
+    """Test reusing or replacing the kernel client across restarts."""
+
+    @pytest.fixture(autouse=True)
+    def mock_client(self, client_registry, kernel_lifecycle):
+        client_registry.register(MockProvisioner, MockKernelClient)
+
+    async def _restart(self, manager):
+        # now=True skips the shutdown request, which needs a live control channel
+        await manager.restart_kernel(now=True)
+
+    async def test_restart_keeps_client_on_same_zmq_info(self, manager):
+        """Test that a kernel restarted on the same ports keeps and resumes its client."""
+        await manager.start_kernel()
+        client = manager.kernel_client
+        assert client.calls == ["connect"]
+
+        await self._restart(manager)
+
+        assert manager.kernel_client is client
+        assert client.calls == ["connect", "stop_listening", "resume"]
+
+    async def test_restart_replaces_client_on_changed_info(self, manager):
+        """Test that a kernel restarted on new ports gets a new client."""
+        await manager.start_kernel()
+        client = manager.kernel_client
+
+        manager.provisioner.connection_info = {**ZMQ_INFO, "shell_port": 60001}
+        await self._restart(manager)
+
+        assert manager.kernel_client is not client
+        assert "stop_channels" in client.calls
+        assert manager.kernel_client.calls == ["connect"]
+
+    async def test_restart_replaces_non_zmq_client(self, manager):
+        """Test that clients on other transports are rebuilt even with the same info."""
+        manager.provisioner.connection_info = {"ws_url": "ws://gateway/kernels/k/channels"}
+        await manager.start_kernel()
+        client = manager.kernel_client
+
+        await self._restart(manager)
+
+        assert manager.kernel_client is not client
+        assert "resume" not in client.calls
+
+    async def test_start_listening_replaces_monitor_tasks(self):
+        """Test that listening again, as resume() does, cancels the previous monitor tasks."""
+        client = JupyterServerKernelClient()
+        stale = asyncio.ensure_future(asyncio.sleep(10))
+        client._monitoring_tasks = [stale]
+
+        await client.start_listening()
+        await asyncio.sleep(0)
+        # Listening opens the channel sockets, which would block the context's teardown
+        await client.stop_listening()
+        client.stop_channels()
+
+        assert stale.cancelled()
+
+
+class TestKernelManagerShutdown:
+    """Test releasing the kernel client on shutdown."""
+
+    async def test_shutdown_releases_client(self, manager, client_registry, kernel_lifecycle):
+        """Test that shutdown_kernel() closes the client and drops it from the manager."""
+        client_registry.register(MockProvisioner, MockKernelClient)
+        await manager.start_kernel()
+        client = manager.kernel_client
+        manager.get_connection_info()
+
+        await manager.shutdown_kernel(now=True)
+
+        assert manager.kernel_client is None
+        assert client.calls == ["connect", "stop_listening", "stop_channels"]
+        assert manager._conninfo_cache == {}